@@ -0,0 +1,288 @@
+"""
+Benchmarks for the planner and predictor hot paths on synthetic schedules.
+
+Results are written as JSON and can be compared against a stored baseline:
+    python cli.py bench                   # run and compare against the baseline
+    python cli.py bench --save-baseline   # run and store the results as the baseline
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+BENCHMARK_RESULTS_PATH = "data/benchmarks/latest.json"
+BENCHMARK_BASELINE_PATH = "data/benchmarks/baseline.json"
+# A benchmark regresses when throughput drops (or peak memory grows) by more than this
+REGRESSION_TOLERANCE = 0.2
+
+
+def make_synthetic_schedule(n_teams=32, n_weeks=18, seed=0):
+    """
+    Random schedule with n_teams teams over the weeks ending at week 18 (the
+    planner's final week). Every team gets exactly one bye week.
+    """
+    if n_teams % 4:
+        raise ValueError("n_teams must be a multiple of 4 so byes come in pairs")
+    rng = np.random.default_rng(seed)
+    teams = [f"T{i:02d}" for i in range(n_teams)]
+    weeks = list(range(19 - n_weeks, 19))
+
+    # Byes are assigned to pairs of teams so every week has an even number playing
+    bye_weeks = {}
+    shuffled = rng.permutation(teams)
+    for pair in range(n_teams // 2):
+        bye_week = weeks[pair % (n_weeks - 1) + 1] if n_weeks > 1 else weeks[0]
+        bye_weeks[shuffled[2 * pair]] = bye_week
+        bye_weeks[shuffled[2 * pair + 1]] = bye_week
+
+    rows = []
+    for week in weeks:
+        playing = rng.permutation([team for team in teams if bye_weeks[team] != week])
+        for home, away in zip(playing[0::2], playing[1::2]):
+            rows.append({"week": week, "home_team": home, "away_team": away})
+    return pd.DataFrame(rows)
+
+
+def make_synthetic_probabilities(schedule, density=0.4, seed=0):
+    """
+    Add win probabilities to a schedule. `density` is the share of games with a
+    favorite above the 0.6 candidate threshold, which controls search branching.
+    """
+    rng = np.random.default_rng(seed)
+    n_games = len(schedule)
+    favorite_probs = np.where(
+        rng.random(n_games) < density,
+        rng.uniform(0.62, 0.95, n_games),
+        rng.uniform(0.5, 0.6, n_games),
+    ).round(4)
+    home_favored = rng.random(n_games) < 0.5
+    probs = schedule.copy()
+    probs["home_win_prob"] = np.where(home_favored, favorite_probs, 1 - favorite_probs).round(4)
+    probs["away_win_prob"] = (1 - probs["home_win_prob"]).round(4)
+    return probs
+
+
+def write_synthetic_data_dir(root, schedule, probs, seed=0):
+    """Write the CSVs the predictor and evaluator read, under root/data."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.join(root, "data"), exist_ok=True)
+    teams = sorted(set(schedule["home_team"]) | set(schedule["away_team"]))
+    pd.DataFrame(
+        {
+            "team": [f"Team {team}" for team in teams],
+            "abbreviation": teams,
+            "projected_wins": rng.uniform(4, 13, len(teams)).round(1),
+            "current_wins": rng.integers(0, 10, len(teams)),
+        }
+    ).to_csv(os.path.join(root, "data", "nfl_projected_wins.csv"), index=False)
+    schedule.to_csv(os.path.join(root, "data", "nfl_schedule.csv"), index=False)
+    probs.iloc[:0].to_csv(os.path.join(root, "data", "nfl_schedule_with_probs.csv"), index=False)
+    pd.DataFrame(
+        columns=list(probs.columns)
+        + ["home_score", "away_score", "home_preadjustment", "away_preadjustment"]
+    ).to_csv(os.path.join(root, "data", "nfl_schedule_with_probs_fullcalcs.csv"), index=False)
+
+    home_wins = rng.random(len(probs)) < probs["home_win_prob"].to_numpy()
+    pd.DataFrame(
+        {
+            "week": probs["week"],
+            "winner": np.where(home_wins, probs["home_team"], probs["away_team"]),
+            "winner_score": 24,
+            "loser": np.where(home_wins, probs["away_team"], probs["home_team"]),
+            "loser_score": 17,
+        }
+    ).assign(
+        winner=lambda df: "Team " + df["winner"], loser=lambda df: "Team " + df["loser"]
+    ).to_csv(os.path.join(root, "data", "all_game_results_df.csv"), index=False)
+
+
+def measure(func, repeat):
+    """Best wall time over `repeat` runs, then one more run under tracemalloc for peak memory."""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            work = func()
+            best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "value": work / best,
+        "seconds": best,
+        "peak_memory_mb": round(peak / 2**20, 3),
+    }
+
+
+def run_benchmarks(
+    n_teams=32, n_weeks=18, density=0.4, simulations=20_000, dfs_weeks=4, repeat=3, seed=0
+):
+    """
+    Time each hot path on a synthetic season. Returns a results dict with one
+    entry per benchmark: throughput `value` in `unit`, best wall time and peak
+    traced memory.
+    """
+    from nfl_survivor_assistant_monte_carlo import NFLSurvivorPickerMonteCarlo
+
+    schedule = make_synthetic_schedule(n_teams, n_weeks, seed)
+    probs = make_synthetic_probabilities(schedule, density, seed)
+    weeks = sorted(probs["week"].unique())
+    results = {}
+
+    def make_picker(sims):
+        picker = NFLSurvivorPickerMonteCarlo(sims, games_with_probs=probs, already_chosen_teams={})
+        picker.current_prediction_week = weeks[0]
+        return picker
+
+    def candidates_bench():
+        make_picker(0).precompute_weekly_candidates(weeks, set())
+        return len(probs)
+
+    results["precompute_weekly_candidates"] = {"unit": "games/sec", **measure(candidates_bench, repeat)}
+
+    candidates = make_picker(0).precompute_weekly_candidates(weeks, set())
+
+    def monte_carlo_bench():
+        make_picker(simulations).search(weeks, candidates, set())
+        return simulations
+
+    if len(weeks) >= 6:
+        results["run_simulation"] = {"unit": "simulations/sec", **measure(monte_carlo_bench, repeat)}
+
+    def dfs_bench():
+        picker = make_picker(0)
+        picker.search(weeks[-dfs_weeks:], candidates, set())
+        return picker.full_dfs_node_counter
+
+    results["full_dfs"] = {"unit": "nodes/sec", **measure(dfs_bench, repeat)}
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        write_synthetic_data_dir(root, schedule, probs, seed)
+        os.chdir(root)
+        try:
+            from win_predictor import NFLWinPredictor
+            from prediction_evaluator import PredictionEvaluator
+
+            def predictor_bench():
+                NFLWinPredictor(weeks[0], False).add_win_probabilities_to_csv()
+                return len(schedule)
+
+            def batch_predictor_bench():
+                NFLWinPredictor(weeks[0], False).batch_win_probabilities([{}] * 8)
+                return 8 * len(schedule)
+
+            def evaluator_bench():
+                evaluator = PredictionEvaluator(
+                    "data/all_game_results_df.csv",
+                    "data/nfl_schedule_with_probs.csv",
+                    "data/nfl_projected_wins.csv",
+                    threshold=0.5,
+                )
+                return evaluator.evaluate_season(verbose=False)[2]
+
+            from team_ratings import TeamRatings, load_game_results
+            from win_predictor import SCALE, HOME_FIELD_ADVANTAGE
+
+            games = load_game_results(schedule=schedule)
+            projected = pd.read_csv("data/nfl_projected_wins.csv")
+            ratings = TeamRatings(
+                dict(zip(projected["abbreviation"], projected["projected_wins"])), SCALE, HOME_FIELD_ADVANTAGE
+            )
+
+            def ratings_replay_bench():
+                ratings.history(games)
+                return len(games)
+
+            results["team_ratings_replay"] = {"unit": "games/sec", **measure(ratings_replay_bench, repeat)}
+            results["add_win_probabilities_to_csv"] = {"unit": "games/sec", **measure(predictor_bench, repeat)}
+            results["batch_win_probabilities"] = {"unit": "games/sec", **measure(batch_predictor_bench, repeat)}
+            results["evaluate_season"] = {"unit": "games/sec", **measure(evaluator_bench, repeat)}
+        finally:
+            os.chdir(original_dir)
+
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "config": {
+            "n_teams": n_teams,
+            "n_weeks": n_weeks,
+            "density": density,
+            "simulations": simulations,
+            "dfs_weeks": dfs_weeks,
+            "seed": seed,
+        },
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_to_baseline(current, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Returns a list of (benchmark, message) for every regression beyond tolerance."""
+    regressions = []
+    if current["config"] != baseline["config"]:
+        print("Warning: benchmark config differs from the baseline, comparison may be meaningless")
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        base = baseline["results"][name]
+        speed_ratio = result["value"] / base["value"]
+        memory_ratio = result["peak_memory_mb"] / max(base["peak_memory_mb"], 1e-9)
+        if speed_ratio < 1 - tolerance:
+            regressions.append((name, f"throughput {speed_ratio:.2f}x of baseline"))
+        if memory_ratio > 1 + tolerance:
+            regressions.append((name, f"peak memory {memory_ratio:.2f}x of baseline"))
+    return regressions
+
+
+def main(
+    results_path=BENCHMARK_RESULTS_PATH,
+    baseline_path=BENCHMARK_BASELINE_PATH,
+    save_baseline=False,
+    tolerance=REGRESSION_TOLERANCE,
+    **benchmark_args,
+):
+    current = run_benchmarks(**benchmark_args)
+    baseline = None
+    if not save_baseline and os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    print(f"{'benchmark':<30}{'throughput':<29}{'seconds':>10}{'peak MB':>10}{'vs base':>9}")
+    for name, result in current["results"].items():
+        ratio = ""
+        if baseline and name in baseline["results"]:
+            ratio = f"{result['value'] / baseline['results'][name]['value']:.2f}x"
+        print(
+            f"{name:<30}{result['value']:>12,.0f} {result['unit']:<16}"
+            f"{result['seconds']:>10.4f}{result['peak_memory_mb']:>10.2f}{ratio:>9}"
+        )
+
+    for path in [results_path] + ([baseline_path] if save_baseline else []):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(current, f, indent=2)
+    print(f"Results written to {results_path}" + (f" and {baseline_path}" if save_baseline else ""))
+
+    if baseline:
+        regressions = compare_to_baseline(current, baseline, tolerance)
+        for name, message in regressions:
+            print(f"REGRESSION {name}: {message}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    main()
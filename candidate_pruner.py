@@ -0,0 +1,120 @@
+import numpy as np
+
+
+class CandidatePruner:
+    def __init__(self, top_k):
+        """
+        top_k: number of best paths the search keeps. A team-week candidate is
+        only removed when no path through it can make the top_k.
+        """
+        self.top_k = top_k
+        self.stats = {}
+
+    def prune(self, candidates, weeks, known_scores=()):
+        """
+        Remove team-week candidates whose best possible path score (upper bound)
+        is strictly below the score of the top_k-th best known path (lower bound).
+        known_scores: scores of feasible paths found earlier (e.g. a previous
+        search), which can only tighten the lower bound.
+        Returns a new candidates dict in the same (teams, opponents, probs) format.
+        """
+        total_before = sum(len(candidates[week][0]) for week in weeks)
+        self.stats = {
+            "candidates_before": total_before,
+            "candidates_after": total_before,
+            "lower_bound": 0.0,
+        }
+        if any(len(candidates[week][0]) == 0 for week in weeks):
+            # No complete path exists, nothing to bound against
+            return candidates
+
+        lower_bound = self.kth_best_lower_bound(candidates, weeks)
+        if len(known_scores) >= self.top_k:
+            lower_bound = max(lower_bound, float(sorted(known_scores, reverse=True)[self.top_k - 1]))
+        self.stats["lower_bound"] = lower_bound
+        if lower_bound <= 0:
+            return candidates
+
+        pruned = dict(candidates)
+        while True:
+            upper_bounds = self.candidate_upper_bounds(pruned, weeks)
+            removed = 0
+            for week in weeks:
+                # Small tolerance so float rounding never drops a path tied at the bound
+                keep = upper_bounds[week] >= lower_bound * (1 - 1e-9)
+                removed += int((~keep).sum())
+                teams, opponents, probs = pruned[week]
+                pruned[week] = (teams[keep], opponents[keep], probs[keep])
+            # Removing candidates can only tighten the remaining upper bounds
+            if not removed:
+                break
+
+        total_after = sum(len(pruned[week][0]) for week in weeks)
+        self.stats["candidates_after"] = total_after
+        print(
+            f"Pruned {total_before - total_after} of {total_before} team-week candidates "
+            f"(top-{self.top_k} lower bound {round(lower_bound * 100, 5)}%)"
+        )
+        return pruned
+
+    def candidate_upper_bounds(self, candidates, weeks):
+        """
+        Upper bound for each candidate: its own probability times the best
+        probability of any other team in every other week. Ignoring the
+        no-repeat rule between the other weeks can only overestimate.
+        """
+        best = {}
+        for week in weeks:
+            teams, _, probs = candidates[week]
+            order = np.argsort(-probs, kind="stable")[:2]
+            best[week] = [(teams[i], probs[i]) for i in order]
+
+        upper_bounds = {}
+        for week in weeks:
+            teams, _, probs = candidates[week]
+            bounds = probs.astype(float).copy()
+            for other_week in weeks:
+                if other_week == week:
+                    continue
+                top = best[other_week]
+                top_team, top_prob = top[0]
+                second_prob = top[1][1] if len(top) > 1 else 0.0
+                bounds *= np.where(teams == top_team, second_prob, top_prob)
+            upper_bounds[week] = bounds
+        return upper_bounds
+
+    def kth_best_lower_bound(self, candidates, weeks):
+        """
+        Beam search keeping the top_k best partial paths each week. Every path it
+        finds is feasible, so the top_k-th best of them is a lower bound on the
+        top_k-th best path overall. Returns 0 if fewer than top_k paths were found.
+        """
+        beam = self.beam_search(candidates, weeks, self.top_k)
+        if len(beam) < self.top_k:
+            return 0.0
+        return float(beam[-1][0])
+
+    def beam_search(self, candidates, weeks, width):
+        """
+        Keep the `width` best partial paths each week. Returns (score, picks)
+        pairs, best first, where picks holds the index of the chosen candidate
+        in each week. Ties keep expansion order, like a stable sort.
+        """
+        all_teams = sorted({team for week in weeks for team in candidates[week][0]})
+        team_to_idx = {team: i for i, team in enumerate(all_teams)}
+        scores = np.ones(1)
+        used = np.zeros((1, len(all_teams)), dtype=bool)
+        picks = np.zeros((1, 0), dtype=int)
+        for week in weeks:
+            teams, _, probs = candidates[week]
+            team_idxs = np.array([team_to_idx[team] for team in teams], dtype=int)
+            expanded = (scores[:, None] * np.asarray(probs, dtype=float)[None, :]).ravel()
+            allowed = np.flatnonzero(~used[:, team_idxs].ravel())
+            best = allowed[np.argsort(-expanded[allowed], kind="stable")[:width]]
+            rows, cols = np.divmod(best, max(len(teams), 1))
+
+            scores = expanded[best]
+            used = used[rows]
+            used[np.arange(len(best)), team_idxs[cols]] = True
+            picks = np.column_stack([picks[rows], cols])
+        return list(zip(scores.tolist(), map(tuple, picks.tolist())))
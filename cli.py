@@ -0,0 +1,341 @@
+"""
+Command line entry point: python cli.py <command> [options]
+
+Only the standard library is imported up front. Each command imports the modules
+(and pandas, matplotlib, requests, bs4) it needs when it runs, so --help and
+cached lookups start instantly.
+"""
+import argparse
+import csv
+import glob
+import os
+import re
+import sys
+
+
+def run_predict(args):
+    import nfl_survivor_assistant_monte_carlo as planner
+    from win_predictor import NFLWinPredictor
+
+    week = args.week or planner.get_current_prediction_week()
+    if args.strength:
+        predictor = NFLWinPredictor(week, not args.no_scrape, strength_model=args.strength)
+    else:
+        predictor = NFLWinPredictor(week, not args.no_scrape)
+    probs = predictor.add_win_probabilities_to_csv()
+    print(probs.to_string(index=False))
+
+
+def run_plan(args):
+    if args.cached:
+        return show_cached_plan(args.pool)
+
+    import nfl_survivor_assistant_monte_carlo as planner
+
+    if args.no_scrape:
+        planner.SHOULD_SCRAPE_CURRENT_WINS = False
+    planner.main(
+        simulations=args.simulations,
+        profile_search=args.profile,
+        seed=args.seed,
+        resume=args.resume,
+        strength_model=args.strength or planner.STRENGTH_MODEL,
+    )
+
+
+def show_cached_plan(pool):
+    """Print the pool's best saved plan for its latest week without recomputing anything."""
+
+    def run_key(picks_path):
+        week_folder, run_folder = picks_path.split(os.sep)[-3:-1]
+        return int(week_folder[len("week") :]), re.match(r"\d*", run_folder).group()
+
+    runs = glob.glob(os.path.join("data", pool, "week*", "*", "picks.csv"))
+    if not runs:
+        print(f"No saved plans found under data/{pool}/")
+        return 1
+
+    picks_path = max(runs, key=run_key)
+    print(f"Best saved plan: {os.path.dirname(picks_path)}\n")
+    options_path = os.path.join(os.path.dirname(picks_path), "weekly_options.txt")
+    if os.path.exists(options_path):
+        with open(options_path) as f:
+            print(f.read())
+    with open(picks_path, newline="") as f:
+        for row in csv.reader(f):
+            print("".join(value.rjust(10) for value in row))
+    return 0
+
+
+def run_evaluate(args):
+    import prediction_evaluator
+
+    prediction_evaluator.main(threshold=args.threshold, plot=args.plot)
+
+
+def run_scrape(args):
+    if args.target in ("standings", "all"):
+        from constants import PROJECTED_WINS_CSV_PATH
+        from team_win_scraper import TeamWinScraper
+
+        TeamWinScraper.update_wins_column_in_csv(PROJECTED_WINS_CSV_PATH)
+    if args.target in ("results", "all"):
+        import game_win_scraper
+        import nfl_survivor_assistant_monte_carlo as planner
+
+        # Later weeks haven't been played yet, same default as the pipeline
+        last_week = args.last_week or planner.get_current_prediction_week() - 1
+        game_win_scraper.main(args.first_week, last_week, args.season)
+
+
+def run_sweep(args):
+    import scenario_sweep
+
+    if args.no_scrape:
+        scenario_sweep.SHOULD_SCRAPE_CURRENT_WINS = False
+    scenario_sweep.ScenarioSweep(simulations=args.simulations, max_workers=args.workers).run()
+
+
+def run_pools(args):
+    import pool_planner
+
+    if args.no_scrape:
+        pool_planner.SHOULD_SCRAPE_CURRENT_WINS = False
+    pool_planner.PoolBatchPlanner(
+        simulations=args.simulations, max_workers=args.workers, seed=args.seed
+    ).run()
+
+
+def run_portfolio(args):
+    import portfolio_optimizer
+
+    if args.no_scrape:
+        portfolio_optimizer.SHOULD_SCRAPE_CURRENT_WINS = False
+    portfolio_optimizer.PortfolioOptimizer(
+        objective=args.objective, simulations=args.simulations
+    ).run()
+
+
+def run_field(args):
+    import nfl_survivor_assistant_monte_carlo as planner
+    import field_simulator
+
+    if args.no_scrape:
+        planner.SHOULD_SCRAPE_CURRENT_WINS = False
+    field_simulator.PoolFieldSimulator(
+        n_opponents=args.opponents, outcome_samples=args.samples
+    ).run(simulations=args.simulations)
+
+
+def run_pipeline(args):
+    import pipeline
+
+    pipeline.main(
+        force=args.force,
+        simulations=args.simulations,
+        seed=args.seed,
+        scrape=not args.no_scrape,
+        first_week=args.first_week,
+        last_week=args.last_week,
+        season=args.season,
+        strength_model=args.strength,
+    )
+
+
+def run_serve(args):
+    import planning_service
+
+    planning_service.serve(port=args.port)
+
+
+def run_watch(args):
+    import watch_mode
+
+    watch_mode.watch(k=args.top, debounce=args.debounce)
+
+
+def run_runs(args):
+    from run_archive import RunArchive
+
+    archive = RunArchive()
+    if args.action == "backfill":
+        print(f"Added {archive.backfill()} saved runs to {archive.path}")
+        return 0
+    if args.action == "diff":
+        if len(args.values) != 2:
+            print("usage: cli.py runs diff RUN_ID_A RUN_ID_B")
+            return 2
+        diff = archive.diff(*args.values)
+        print(f"Best score change: {diff['best_score_change']:+.5f}")
+        print(f"Changed inputs: {', '.join(diff['changed_inputs']) or 'none'}")
+        for week, (pick_a, pick_b) in diff["changed_picks"].items():
+            print(f"Week {week}: {pick_a[0] if pick_a else '-'} -> {pick_b[0] if pick_b else '-'}")
+        return 0
+
+    if args.action == "best":
+        runs = list(archive.best_per_week(args.pool, args.scores).values())
+    elif args.action == "pick":
+        if len(args.values) != 1:
+            print("usage: cli.py runs pick TEAM [--week N]")
+            return 2
+        runs = archive.runs_with_top_pick(args.values[0], args.week, args.pool)
+    else:
+        runs = archive.runs(args.pool)
+    print(f"{'run_id':<50}{'week':>5}  {'timestamp':<20}{'strategy':<14}{'score':>9}  pick")
+    for run in runs:
+        pick = next((team for week, team, _, _ in run["best_path"] if week == run["week"]), "")
+        print(
+            f"{run['run_id']:<50}{run['week']:>5}  {run['timestamp']:<20}"
+            f"{run['strategy']:<14}{run['best_score']:>9.5f}  {pick}"
+        )
+    return 0
+
+
+def run_validate(args):
+    import pandas as pd
+    from schedule_validator import validate_schedule
+
+    errors = validate_schedule(pd.read_csv(args.path))
+    for error in errors:
+        print(error["message"])
+    print(f"{args.path}: {len(errors)} problems found" if errors else f"{args.path} is valid")
+    return 1 if errors else 0
+
+
+def run_bench(args):
+    import benchmark
+
+    return benchmark.main(
+        save_baseline=args.save_baseline,
+        tolerance=args.tolerance,
+        n_teams=args.teams,
+        n_weeks=args.weeks,
+        density=args.density,
+        simulations=args.simulations,
+        dfs_weeks=args.dfs_weeks,
+        repeat=args.repeat,
+    )
+
+
+def build_parser():
+    # Defaults are literals rather than imports from the modules to keep startup fast
+    parser = argparse.ArgumentParser(description="NFL Survivor Assistant")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    predict = commands.add_parser("predict", help="Write win probabilities for the remaining weeks")
+    predict.add_argument("--week", type=int, help="First week to predict (default: next unpicked week)")
+    predict.add_argument("--no-scrape", action="store_true", help="Skip scraping current wins")
+    predict.add_argument("--strength", choices=["blend", "elo"], help="Team strength model (default: STRENGTH_MODEL in win_predictor.py)")
+    predict.set_defaults(func=run_predict)
+
+    plan = commands.add_parser("plan", help="Search for the best pick paths")
+    plan.add_argument("--simulations", type=int, default=10_000_000)
+    plan.add_argument("--no-scrape", action="store_true", help="Skip scraping current wins")
+    plan.add_argument("--cached", action="store_true", help="Show the best saved plan instead of searching")
+    plan.add_argument(
+        "--pool",
+        default="second_chance",
+        help="Pool whose saved plan --cached shows, e.g. first_chance or a POOLS name (default: second_chance, the pool plan searches)",
+    )
+    plan.add_argument("--seed", type=int, help="Seed the search so reruns find the same paths")
+    plan.add_argument("--resume", action="store_true", help="Continue from the week's checkpoint")
+    plan.add_argument("--profile", action="store_true", help="Save a flame-graph profile of the search next to picks.csv")
+    plan.add_argument("--strength", choices=["blend", "elo"], help="Team strength model (default: STRENGTH_MODEL in win_predictor.py)")
+    plan.set_defaults(func=run_plan)
+
+    evaluate = commands.add_parser("evaluate", help="Score past predictions against game results")
+    evaluate.add_argument("--threshold", type=float, default=0.5)
+    evaluate.add_argument("--plot", action="store_true", help="Plot accuracy by threshold")
+    evaluate.set_defaults(func=run_evaluate)
+
+    scrape = commands.add_parser("scrape", help="Scrape standings and/or game results")
+    scrape.add_argument("target", choices=["standings", "results", "all"])
+    scrape.add_argument("--first-week", type=int, default=1)
+    scrape.add_argument("--last-week", type=int, help="Last week of game results to scrape (default: last picked week)")
+    scrape.add_argument("--season", type=int, default=2025)
+    scrape.set_defaults(func=run_scrape)
+
+    sweep = commands.add_parser("sweep", help="Compare adjustment scenarios from scenario_sweep.py")
+    sweep.add_argument("--simulations", type=int, default=1_000_000)
+    sweep.add_argument("--workers", type=int)
+    sweep.add_argument("--no-scrape", action="store_true", help="Skip scraping current wins")
+    sweep.set_defaults(func=run_sweep)
+
+    pools = commands.add_parser("pools", help="Plan every pool in POOLS (pool_planner.py) in one run")
+    pools.add_argument("--simulations", type=int, default=1_000_000)
+    pools.add_argument("--workers", type=int)
+    pools.add_argument("--seed", type=int)
+    pools.add_argument("--no-scrape", action="store_true", help="Skip scraping current wins")
+    pools.set_defaults(func=run_pools)
+
+    portfolio = commands.add_parser("portfolio", help="Choose paths jointly for PORTFOLIO_ENTRIES")
+    portfolio.add_argument("--objective", choices=["any_survives", "expected_survivors"], default="any_survives")
+    portfolio.add_argument("--simulations", type=int, default=1_000_000)
+    portfolio.add_argument("--no-scrape", action="store_true", help="Skip scraping current wins")
+    portfolio.set_defaults(func=run_portfolio)
+
+    field = commands.add_parser("field", help="Rank paths by expected share of the pot against a simulated field")
+    field.add_argument("--opponents", type=int, default=100_000)
+    field.add_argument("--samples", type=int, default=10_000)
+    field.add_argument("--simulations", type=int, default=1_000_000)
+    field.add_argument("--no-scrape", action="store_true", help="Skip scraping current wins")
+    field.set_defaults(func=run_field)
+
+    pipe = commands.add_parser("pipeline", help="Scrape, predict and plan, rerunning only stages whose inputs changed")
+    pipe.add_argument("--simulations", type=int, default=10_000_000)
+    pipe.add_argument("--seed", type=int)
+    pipe.add_argument("--no-scrape", action="store_true", help="Leave out the scrape stages")
+    pipe.add_argument("--force", action="append", default=[], metavar="STAGE", help="Rerun a stage even if cached (repeatable)")
+    pipe.add_argument("--first-week", type=int, default=1, help="First week of game results to scrape")
+    pipe.add_argument("--last-week", type=int, help="Last week of game results to scrape (default: last picked week)")
+    pipe.add_argument("--season", type=int, default=2025)
+    pipe.add_argument("--strength", choices=["blend", "elo"], help="Team strength model (default: STRENGTH_MODEL in win_predictor.py)")
+    pipe.set_defaults(func=run_pipeline)
+
+    serve = commands.add_parser("serve", help="Answer what-if questions over a local JSON API (see planning_service.py)")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.set_defaults(func=run_serve)
+
+    watch = commands.add_parser("watch", help="Replan whenever the adjustments or input CSVs are saved")
+    watch.add_argument("--top", type=int, default=5, help="Number of paths to print")
+    watch.add_argument("--debounce", type=float, default=0.75, help="Seconds to wait for a burst of saves to finish")
+    watch.set_defaults(func=run_watch)
+
+    runs = commands.add_parser("runs", help="Query the archive of past planning runs")
+    runs.add_argument("action", choices=["list", "best", "pick", "diff", "backfill"], nargs="?", default="list")
+    runs.add_argument("values", nargs="*", help="TEAM for pick, two run IDs for diff")
+    runs.add_argument("--week", type=int, help="Week for pick (default: each run's own week)")
+    runs.add_argument("--pool", help="Only runs for this pool (e.g. second_chance)")
+    runs.add_argument(
+        "--scores",
+        choices=["survival", "robust_expected", "robust_quantile"],
+        default="survival",
+        help="Score type compared by best (robust scores aren't comparable to plain survival)",
+    )
+    runs.set_defaults(func=run_runs)
+
+    validate = commands.add_parser("validate", help="Check a schedule CSV for duplicate games, byes and game counts")
+    validate.add_argument("path", nargs="?", default="data/nfl_schedule.csv")
+    validate.set_defaults(func=run_validate)
+
+    bench = commands.add_parser("bench", help="Benchmark the hot paths on a synthetic season")
+    bench.add_argument("--teams", type=int, default=32)
+    bench.add_argument("--weeks", type=int, default=18)
+    bench.add_argument("--density", type=float, default=0.4, help="Share of games with a favorite above 0.6")
+    bench.add_argument("--simulations", type=int, default=20_000)
+    bench.add_argument("--dfs-weeks", type=int, default=4, help="Weeks enumerated by the full DFS (at most 5)")
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging a regression")
+    bench.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    bench.set_defaults(func=run_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,3 +2,5 @@ SCHEDULE_CSV_PATH = "data/nfl_schedule.csv"
 SCHEDULE_WITH_PROBABILITIES_PATH = "data/nfl_schedule_with_probs.csv"
 FULL_CALC_CSV_PATH = "data/nfl_schedule_with_probs_fullcalcs.csv"
 PROJECTED_WINS_CSV_PATH = "data/nfl_projected_wins.csv"
+GAME_RESULTS_CSV_PATH = "data/all_game_results_df.csv"
+ADJUSTMENTS_MODULE_PATH = "win_predictor_adjustments_helper.py"
@@ -0,0 +1,198 @@
+import os
+import numpy as np
+import pandas as pd
+from nfl_survivor_assistant_monte_carlo import (
+    NFLSurvivorPickerMonteCarlo,
+    NUM_SIMULATIONS,
+)
+
+FIELD_OPPONENTS = 100_000
+FIELD_OUTCOME_SAMPLES = 10_000
+# "softmax": weight exp(sharpness * win_prob), "proportional": win_prob ** sharpness,
+# "uniform": every candidate equally likely
+FIELD_POPULARITY_MODEL = "softmax"
+FIELD_POPULARITY_SHARPNESS = 12
+# Upper bound on booleans held at once while counting surviving opponents
+FIELD_CHUNK_ELEMENTS = 50_000_000
+
+
+class PoolFieldSimulator:
+    def __init__(
+        self,
+        n_opponents=FIELD_OPPONENTS,
+        outcome_samples=FIELD_OUTCOME_SAMPLES,
+        popularity_model=FIELD_POPULARITY_MODEL,
+        popularity_sharpness=FIELD_POPULARITY_SHARPNESS,
+        seed=None,
+    ):
+        if popularity_model not in ("softmax", "proportional", "uniform"):
+            raise ValueError(f"Unknown popularity model: {popularity_model}")
+        self.n_opponents = n_opponents
+        self.outcome_samples = outcome_samples
+        self.popularity_model = popularity_model
+        self.popularity_sharpness = popularity_sharpness
+        self.rng = np.random.default_rng(seed)
+
+    def run(self, simulations=NUM_SIMULATIONS):
+        """
+        Search our candidate paths, then rank them by expected share of the pot
+        against a simulated field. Returns the ranking as a DataFrame.
+        """
+        picker = NFLSurvivorPickerMonteCarlo(simulations)
+        weeks = picker.get_search_weeks()
+        used_teams = picker.get_used_teams()
+        top_paths = picker.search(weeks, picker.build_candidates(weeks, used_teams), used_teams)
+        # The field's earlier picks are unknown, so opponents start with every
+        # team, and our forced picks in CHOOSE_THIS_WEEK don't bind them
+        field_candidates = picker.precompute_weekly_candidates(weeks, set(), forced_picks=False)
+
+        ranking = self.evaluate_paths(picker.games_with_probs, weeks, field_candidates, top_paths)
+        print(ranking.head(10).to_string(index=False))
+        week_folder = picker.get_week_folder()
+        os.makedirs(week_folder, exist_ok=True)
+        ranking.to_csv(f"{week_folder}/field_ev.csv", index=False)
+        return ranking
+
+    def evaluate_paths(self, games, weeks, field_candidates, top_paths):
+        """
+        games: probability table with week, home/away teams and win probs
+        field_candidates: per-week (teams, opponents, probs) the field picks from
+        top_paths: our (score, path) tuples
+
+        The entries that survive the most weeks split the pot. Returns our paths
+        with survival, expected share of the pot and EV per entry fee.
+        """
+        teams = np.unique(np.concatenate([games["home_team"], games["away_team"]]))
+        team_to_idx = {team: i for i, team in enumerate(teams)}
+
+        field_paths = self.sample_field_paths(weeks, field_candidates, team_to_idx, len(teams))
+        our_paths = np.array(
+            [[team_to_idx[team] for _, team, _, _ in path] for _, path in top_paths],
+            dtype=np.int8,
+        ).reshape(len(top_paths), len(weeks))
+        prefix_tree = self.build_prefix_tree(field_paths)
+
+        shares = np.zeros(len(top_paths))
+        survival = np.zeros(len(top_paths))
+        chunk = max(1, FIELD_CHUNK_ELEMENTS // max(len(prefix_tree[-1][2]), 1))
+        for start in range(0, self.outcome_samples, chunk):
+            n_samples = min(chunk, self.outcome_samples - start)
+            wins = self.simulate_team_wins(games, weeks, team_to_idx, len(teams), n_samples)
+
+            field_at_least = self.count_field_survivors(wins, prefix_tree)
+            our_weeks_survived = self.weeks_survived(wins, our_paths)
+            survival += (our_weeks_survived == len(weeks)).sum(axis=1)
+
+            # Only the entries with the most weeks survived share the pot
+            samples = np.arange(n_samples)[None, :]
+            field_longer = field_at_least[our_weeks_survived + 1, samples]
+            field_tied = field_at_least[our_weeks_survived, samples] - field_longer
+            shares += np.where(field_longer == 0, 1 / (1 + field_tied), 0).sum(axis=1)
+
+        shares /= self.outcome_samples
+        ranking = pd.DataFrame(
+            {
+                "path": [
+                    ", ".join(f"{week}: {team}" for week, team, _, _ in path)
+                    for _, path in top_paths
+                ],
+                "survival": survival / self.outcome_samples,
+                "expected_share": shares,
+                "ev_per_entry_fee": shares * (self.n_opponents + 1),
+            }
+        )
+        return ranking.sort_values("expected_share", ascending=False, kind="stable")
+
+    def popularity_weights(self, probs):
+        if self.popularity_model == "softmax":
+            return np.exp(self.popularity_sharpness * (probs - probs.max()))
+        if self.popularity_model == "proportional":
+            return probs**self.popularity_sharpness
+        return np.ones_like(probs)
+
+    def sample_field_paths(self, weeks, field_candidates, team_to_idx, n_teams):
+        """
+        Sample opponent entries week by week, all opponents at once. Each opponent
+        picks among the week's candidates it has not used yet, with probability
+        proportional to the popularity weights. Returns an (n_opponents, n_weeks)
+        int8 array of team IDs, with n_teams meaning no pick left (eliminated).
+        """
+        used = np.zeros((self.n_opponents, n_teams + 1), dtype=bool)
+        paths = np.full((self.n_opponents, len(weeks)), n_teams, dtype=np.int8)
+        for col, week in enumerate(weeks):
+            teams, _, probs = field_candidates[week]
+            if len(teams) == 0:
+                continue
+            team_ids = np.array([team_to_idx[team] for team in teams])
+            weights = self.popularity_weights(probs.astype(float))[None, :] * ~used[:, team_ids]
+            cumulative = np.cumsum(weights, axis=1)
+            totals = cumulative[:, -1]
+            draws = self.rng.random(self.n_opponents) * totals
+            choice = np.minimum((cumulative <= draws[:, None]).sum(axis=1), len(teams) - 1)
+            picked = totals > 0
+            paths[picked, col] = team_ids[choice[picked]]
+            used[np.flatnonzero(picked), team_ids[choice[picked]]] = True
+        return paths
+
+    def build_prefix_tree(self, field_paths):
+        """
+        Group opponents by their picks so far. For each week returns (parent prefix
+        index, team picked, number of opponents) per distinct prefix, so survivors
+        are counted per distinct prefix instead of per opponent.
+        """
+        tree = []
+        parent_inverse = np.zeros(len(field_paths), dtype=np.int64)
+        for col in range(field_paths.shape[1]):
+            prefixes, first_row, inverse = np.unique(
+                field_paths[:, : col + 1], axis=0, return_index=True, return_inverse=True
+            )
+            inverse = inverse.reshape(-1)
+            tree.append(
+                (
+                    parent_inverse[first_row],
+                    prefixes[:, col].astype(np.int64),
+                    np.bincount(inverse, minlength=len(prefixes)).astype(np.float32),
+                )
+            )
+            parent_inverse = inverse
+        return tree
+
+    def simulate_team_wins(self, games, weeks, team_to_idx, n_teams, n_samples):
+        """
+        Returns an (n_weeks, n_teams + 1, n_samples) boolean array: did the team win
+        its game that week. Byes and the extra no-pick column are always losses.
+        Samples are the last axis so gathering rows by team stays contiguous.
+        """
+        wins = np.zeros((len(weeks), n_teams + 1, n_samples), dtype=bool)
+        for col, week in enumerate(weeks):
+            week_games = games[games["week"] == week]
+            home = week_games["home_team"].map(team_to_idx).to_numpy()
+            away = week_games["away_team"].map(team_to_idx).to_numpy()
+            draws = self.rng.random((len(week_games), n_samples))
+            wins[col, home] = draws < week_games["home_win_prob"].to_numpy()[:, None]
+            wins[col, away] = draws >= 1 - week_games["away_win_prob"].to_numpy()[:, None]
+        return wins
+
+    def count_field_survivors(self, wins, prefix_tree):
+        """
+        Returns an (n_weeks + 2, n_samples) array where row k is the number of
+        opponents that survived at least k weeks (the last row is always 0).
+        """
+        n_weeks, _, n_samples = wins.shape
+        at_least = np.zeros((n_weeks + 2, n_samples))
+        at_least[0] = self.n_opponents
+        alive = np.ones((1, n_samples), dtype=bool)
+        for col, (parents, picks, counts) in enumerate(prefix_tree):
+            alive = alive[parents] & wins[col, picks]
+            at_least[col + 1] = counts @ alive.astype(np.float32)
+        return at_least
+
+    def weeks_survived(self, wins, paths):
+        """Returns (n_paths, n_samples) consecutive weeks won from the first week."""
+        n_weeks = wins.shape[0]
+        won = wins[np.arange(n_weeks)[None, :], paths.astype(np.int64)]
+        return np.cumprod(won, axis=1).sum(axis=1)
+
+
+if __name__ == "__main__":
+    PoolFieldSimulator().run()
@@ -75,12 +75,17 @@ class GameWinScraper:
     def get_all_games_df(self) -> pd.DataFrame:
         return self.all_games
 
-base_url = "https://www.pro-football-reference.com/years/2025/week_"
-scraper = GameWinScraper(base_url)
+def main(first_week=12, last_week=13, season=2025):
+    base_url = f"https://www.pro-football-reference.com/years/{season}/week_"
+    scraper = GameWinScraper(base_url)
 
-for week in range(12, 14):
-    scraper.get_games_df(week)
-    time.sleep(3)
+    for week in range(first_week, last_week + 1):
+        scraper.get_games_df(week)
+        time.sleep(3)
 
-all_df = scraper.get_all_games_df()
-all_df.to_csv('data/all_game_results_df.csv', index=False)
\ No newline at end of file
+    all_df = scraper.get_all_games_df()
+    all_df.to_csv('data/all_game_results_df.csv', index=False)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -2,7 +2,15 @@ from calendar import week
 import pandas as pd
 import numpy as np
 import os
-from win_predictor import NFLWinPredictor
+import json
+import hashlib
+from win_predictor import NFLWinPredictor, STRENGTH_MODEL
+from candidate_pruner import CandidatePruner
+from robust_planner import RobustPathEvaluator
+from run_metrics import RunMetrics, SamplingProfiler
+from path_store import TopPathStore, encode_paths
+from run_archive import RunArchive, input_hashes
+from constants import PROJECTED_WINS_CSV_PATH, SCHEDULE_WITH_PROBABILITIES_PATH
 from datetime import datetime
 from win_predictor_adjustments_helper import ALREADY_CHOSEN_TEAMS
 
@@ -13,33 +21,212 @@ CHOOSE_THIS_WEEK = {
 NUM_SIMULATIONS = 10_000_000
 SHOULD_SCRAPE_CURRENT_WINS = True
 SECOND_CHANCE_WEEK_START = 6
+TOP_PATHS_TO_KEEP = 100
+# Only picks more likely to win than this are searched
+CANDIDATE_WIN_PROB_THRESHOLD = 0.6
+# None ranks paths by point-estimate survival, "expected" or "quantile" re-ranks
+# them by survival across perturbed probability tables
+ROBUST_RANKING = None
+# Point-estimate top paths that robust ranking re-ranks. Candidate pruning then
+# only removes candidates that can't reach this many paths
+ROBUST_CANDIDATE_PATHS = 1000
+
+def get_current_prediction_week(already_chosen_teams=ALREADY_CHOSEN_TEAMS, start_week=SECOND_CHANCE_WEEK_START):
+    return (
+        max(already_chosen_teams.keys()) + 1
+        if already_chosen_teams
+        else max(start_week, 1)
+    )
+
+
+def predict_weeks(first_week, current_week, should_scrape=SHOULD_SCRAPE_CURRENT_WINS):
+    """
+    Probability table for every game from first_week on, for planning entries
+    or pools that are at different weeks. Team strength is as of current_week
+    (the latest week any of them reached, i.e. how much of the season has been
+    played); games before it keep the probabilities saved when their week was
+    current.
+    """
+    NFLWinPredictor(current_week, should_scrape).add_win_probabilities_to_csv()
+    games = pd.read_csv(SCHEDULE_WITH_PROBABILITIES_PATH)
+    return games.loc[games["week"] >= first_week].reset_index(drop=True)
+
+
+def candidate_sides(games_with_probs, weeks=None):
+    """
+    Both sides of every game as {week: (teams, opponents, probs)}, the home
+    team first for each game. Candidates for any threshold and used teams are
+    masks over these arrays.
+    """
+    if weeks is not None:
+        games_with_probs = games_with_probs[games_with_probs["week"].isin(weeks)]
+    sides = {}
+    for week, games in games_with_probs.groupby("week", sort=True):
+        home = games["home_team"].to_numpy(dtype=str)
+        away = games["away_team"].to_numpy(dtype=str)
+        sides[week] = (
+            np.column_stack([home, away]).ravel(),
+            np.column_stack([away, home]).ravel(),
+            np.column_stack(
+                [games["home_win_prob"].to_numpy(dtype=float), games["away_win_prob"].to_numpy(dtype=float)]
+            ).ravel(),
+        )
+    return sides
+
 
 class NFLSurvivorPickerMonteCarlo:
-    def __init__(self, simulations=NUM_SIMULATIONS):
+    def __init__(
+        self,
+        simulations=NUM_SIMULATIONS,
+        games_with_probs=None,
+        already_chosen_teams=ALREADY_CHOSEN_TEAMS,
+        profile_search=False,
+        seed=None,
+        resume=False,
+        start_week=SECOND_CHANCE_WEEK_START,
+        candidate_threshold=CANDIDATE_WIN_PROB_THRESHOLD,
+        pool_name=None,
+        strength_model=STRENGTH_MODEL,
+        choose_this_week=CHOOSE_THIS_WEEK,
+    ):
+        """
+        games_with_probs: optional precomputed probability table. When given, the
+        predictor (and its scraping) is skipped entirely.
+        already_chosen_teams: picks made so far, same format as ALREADY_CHOSEN_TEAMS
+        profile_search: sample the search phase and save a collapsed-stack profile
+        (search_profile.folded) next to picks.csv
+        seed: seed for the Monte Carlo search, runs with the same seed and inputs
+        find the same paths
+        resume: continue the Monte Carlo search from the week folder's checkpoint
+        start_week: first week of the pool, 0 for a season-long (first chance) pool
+        candidate_threshold: minimum win probability for a pick to be searched
+        pool_name: results go to data/<pool_name>/weekN (default first_chance or
+        second_chance, from start_week)
+        strength_model: team strength model for the predictor, "blend" or "elo"
+        choose_this_week: picks to force in open weeks, same format as
+        CHOOSE_THIS_WEEK
+        """
         self.simulations = simulations
-        self.current_prediction_week = (
-            max(ALREADY_CHOSEN_TEAMS.keys()) + 1
-            if ALREADY_CHOSEN_TEAMS
-            else max(SECOND_CHANCE_WEEK_START, 1)
-        )
-
-        game_predictor = NFLWinPredictor(
-            self.current_prediction_week, SHOULD_SCRAPE_CURRENT_WINS
-        )
-        self.games_with_probs = game_predictor.add_win_probabilities_to_csv()
+        self.already_chosen_teams = already_chosen_teams
+        self.choose_this_week = choose_this_week
+        self.start_week = start_week
+        self.candidate_threshold = candidate_threshold
+        self.pool_name = pool_name or ("second_chance" if start_week > 0 else "first_chance")
+        self.current_prediction_week = get_current_prediction_week(already_chosen_teams, start_week)
+        self.metrics = RunMetrics()
+        self.profile_search = profile_search
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.resume = resume
+        self.strength_model = strength_model
+        # Set by do_monte_carlo_simulations, searches run elsewhere don't checkpoint
+        self.checkpoint_path = None
+
+        self.game_predictor = None
+        if games_with_probs is None:
+            if SHOULD_SCRAPE_CURRENT_WINS:
+                from team_win_scraper import TeamWinScraper
+
+                with self.metrics.stage("scrape"):
+                    TeamWinScraper.update_wins_column_in_csv(PROJECTED_WINS_CSV_PATH)
+            with self.metrics.stage("predict"):
+                self.game_predictor = NFLWinPredictor(
+                    self.current_prediction_week, False, self.strength_model
+                )
+                games_with_probs = self.game_predictor.add_win_probabilities_to_csv()
+        self.games_with_probs = games_with_probs
+        self.candidate_pruner = CandidatePruner(TOP_PATHS_TO_KEEP)
         self.full_dfs_counter = 0
-        self.full_dfs_top_paths = set()
+        self.full_dfs_node_counter = 0
+        self.full_dfs_top_paths = None
+        self.full_dfs_team_to_idx = None
+        self.bound_pruned_counter = 0
+        self.top_k_churn = []
+        self.last_output_folder = None
 
     def do_monte_carlo_simulations(self):
-        top_paths = set()  # Set of (score, path) tuples
-        best_score = float("-inf")
-        weeks = [
+        weeks = self.get_search_weeks()
+        used_teams = self.get_used_teams()
+        with self.metrics.stage("candidate_build"):
+            candidates = self.build_candidates(weeks, used_teams)
+        self.checkpoint_path = f"{self.get_week_folder()}/checkpoint.npz"
+
+        profiler = SamplingProfiler() if self.profile_search else None
+        with self.metrics.stage("search"):
+            if profiler:
+                with profiler:
+                    top_paths = self.search(weeks, candidates, used_teams)
+            else:
+                top_paths = self.search(weeks, candidates, used_teams)
+
+        with self.metrics.stage("save"):
+            result = self.save_results(top_paths)
+            self.archive_run(top_paths, self.search_strategy())
+
+        self.record_metrics()
+        self.metrics.write(f"{self.last_output_folder}/metrics.json")
+        if profiler:
+            profiler.write(f"{self.last_output_folder}/search_profile.folded")
+        return result
+
+    def archive_run(self, top_paths, strategy):
+        RunArchive().record(
+            self.current_prediction_week,
+            top_paths,
+            self.last_output_folder,
+            strategy=strategy,
+            simulations=self.simulations,
+            seed=self.seed,
+            hashes=input_hashes(self.games_with_probs),
+            pool=self.pool_name,
+        )
+
+    def record_metrics(self):
+        search_seconds = self.metrics.stage_seconds.get("search", 0)
+        self.metrics.set("simulations", self.simulations)
+        self.metrics.set(
+            "simulations_per_sec",
+            round(self.simulations / search_seconds, 1) if search_seconds else None,
+        )
+        self.metrics.set("candidate_pruning", self.candidate_pruner.stats)
+        self.metrics.set("top_k_churn", self.top_k_churn)
+        self.metrics.increment("paths_pruned_by_bound", self.bound_pruned_counter)
+        self.metrics.increment("full_dfs_paths", self.full_dfs_counter)
+        self.metrics.increment("full_dfs_nodes", self.full_dfs_node_counter)
+
+    def search_strategy(self):
+        strategy = "full_dfs" if self.full_dfs_counter else "monte_carlo"
+        if ROBUST_RANKING and self.game_predictor:
+            strategy += f"+robust_{ROBUST_RANKING}"
+        return strategy
+
+    def paths_to_rank(self):
+        """Number of point-estimate top paths the search keeps."""
+        return ROBUST_CANDIDATE_PATHS if ROBUST_RANKING and self.game_predictor else TOP_PATHS_TO_KEEP
+
+    def get_search_weeks(self):
+        return [
             x
             for x in sorted(self.games_with_probs["week"].unique())
             if x >= self.current_prediction_week
         ]
-        used_teams = set(team for team, _, _ in ALREADY_CHOSEN_TEAMS.values())
-        candidates = self.precompute_weekly_candidates(weeks, used_teams)
+
+    def get_used_teams(self):
+        return set(team for team, _, _ in self.already_chosen_teams.values())
+
+    def build_candidates(self, weeks, used_teams, sides=None):
+        candidates = self.precompute_weekly_candidates(weeks, used_teams, sides)
+        # Built here rather than in __init__, since a predictor for robust
+        # ranking can be attached after the picker is created
+        self.candidate_pruner = CandidatePruner(self.paths_to_rank())
+        return self.candidate_pruner.prune(candidates, weeks)
+
+    def search(self, weeks, candidates, used_teams):
+        """
+        Run the full DFS (few weeks left) or the Monte Carlo search over the
+        given candidates. Returns the top (score, path) tuples, best first.
+        """
+        best_score = float("-inf")
         week_indices = {week: i for i, week in enumerate(weeks)}
         n_weeks = len(weeks)
         all_teams = np.unique(
@@ -47,23 +234,48 @@ class NFLSurvivorPickerMonteCarlo:
         )
         team_to_idx = {team: i for i, team in enumerate(all_teams)}
         n_teams = len(all_teams)
+        top_paths = TopPathStore(n_weeks, self.paths_to_rank())
 
         if n_weeks < 6:
             print("Less than 6 weeks remaining, enumerating all possible paths instead.")
             self.simulations = 0
 
+            self.full_dfs_top_paths = top_paths
+            self.full_dfs_team_to_idx = team_to_idx
             best_score = self.full_dfs(
                 candidates, min(weeks), used_teams, [], 1, best_score=float("-inf")
             )
-            top_paths = self.full_dfs_top_paths
             print('Explored ', self.full_dfs_counter, ' paths in full DFS.')
 
-        for sim in range(self.simulations):
-            if sim and not sim % int(self.simulations / 10):
-                print(f"After {sim} simulations, best probability is: {round(best_score * 100, 5)}%")
+        start_sim = 0
+        fingerprint = self.candidates_fingerprint(weeks, candidates, used_teams)
+        if self.simulations and self.resume and self.checkpoint_path:
+            if os.path.exists(self.checkpoint_path):
+                start_sim, best_score = self.load_checkpoint(top_paths, fingerprint)
+                print(f"Resuming from checkpoint after {start_sim} simulations.")
+            else:
+                print(f"No checkpoint at {self.checkpoint_path}, starting from scratch.")
 
+        previous_top = set(
+            row.tobytes() for row in top_paths.sorted_arrays(TOP_PATHS_TO_KEEP)[1]
+        )
+        for sim in range(start_sim, self.simulations):
+            if sim > start_sim and not sim % int(self.simulations / 10):
+                print(f"After {sim} simulations, best probability is: {round(best_score * 100, 5)}%")
+                # How many of the current top paths are new since the last report
+                current_top = set(
+                    row.tobytes() for row in top_paths.sorted_arrays(TOP_PATHS_TO_KEEP)[1]
+                )
+                self.top_k_churn.append(len(current_top - previous_top))
+                previous_top = current_top
+                if self.checkpoint_path:
+                    self.save_checkpoint(sim, best_score, top_paths, fingerprint)
+
+            # Robust ranking needs the whole top paths_to_rank(), so samples are
+            # only cut short once they can't make it rather than the best
+            bound = top_paths.floor if ROBUST_RANKING and self.game_predictor else max(best_score, 0)
             path, score = self.run_simulation(
-                best_score if best_score != float("-inf") else 0,
+                bound,
                 weeks,
                 candidates,
                 week_indices,
@@ -74,30 +286,53 @@ class NFLSurvivorPickerMonteCarlo:
             )
 
             if score > 0:
-                top_paths.add((score, tuple(path)))
+                top_paths.add(score, path)
                 if score > best_score:
                     best_score = score
-                if len(top_paths) > 5000:
-                    top_paths = set(sorted(top_paths, key=lambda x: -x[0])[:100])
-
-        # After all simulations, get top 100
-        top_paths = sorted(top_paths, key=lambda x: -x[0])[:100]
 
-        all_result_weeks = [
-            x
-            for x in sorted(self.games_with_probs["week"].unique())
-            if x >= SECOND_CHANCE_WEEK_START
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+        # After all simulations, get top paths. Robust re-ranking sees the
+        # point-estimate top ROBUST_CANDIDATE_PATHS, not only the final top
+        scores, team_ids = top_paths.sorted_arrays(self.paths_to_rank())
+        top_paths = self.decode_paths(scores, team_ids, weeks, candidates, team_to_idx)
+        if ROBUST_RANKING and self.game_predictor:
+            # Drawn from the search's generator, so seeded and resumed runs
+            # perturb the tables the same way
+            evaluator = RobustPathEvaluator(
+                self.game_predictor.get_game_scores(),
+                self.game_predictor.scale,
+                seed=int(self.rng.integers(2**32)),
+            )
+            top_paths = evaluator.rank_paths(top_paths, ROBUST_RANKING)
+        return top_paths[:TOP_PATHS_TO_KEEP]
+
+    def decode_paths(self, scores, team_ids, weeks, candidates, team_to_idx):
+        """Turn team-ID rows back into (score, path) tuples using the candidates."""
+        lookup = [
+            {
+                team_to_idx[team]: (week, team, opponent, prob)
+                for team, opponent, prob in zip(*candidates[week])
+            }
+            for week in weeks
+        ]
+        return [
+            (float(score), tuple(lookup[col][team_id] for col, team_id in enumerate(row)))
+            for score, row in zip(scores, team_ids.tolist())
         ]
-        result = self.save_results(all_result_weeks, top_paths)
-        return result
 
     def run_simulation(
-        self, best_score, weeks, candidates, week_indices, n_weeks, team_to_idx, n_teams, used_teams
+        self, bound, weeks, candidates, week_indices, n_weeks, team_to_idx, n_teams, used_teams
     ):
+        """
+        Returns the sampled path as an int8 array of team IDs and its score, 0
+        when it was cut short because it could no longer reach `bound`.
+        """
         used_mask = np.zeros(n_teams, dtype=bool)
         for team in used_teams:
             used_mask[team_to_idx[team]] = True
-        path = []
+        path = np.empty(n_weeks, dtype=np.int8)
         score = 1.0
 
         for week in weeks:
@@ -108,31 +343,84 @@ class NFLSurvivorPickerMonteCarlo:
                 score = 0
                 break
 
-            available_teams = teams[mask]
+            available_idxs = team_idxs[mask]
             available_probs = probs[mask]
-            available_opponents = opponents[mask]
 
-            available_probs_sum = available_probs.sum()
-            if available_probs_sum == 0:
+            # Sample proportional to win probability from the seeded generator
+            cumulative_probs = np.cumsum(available_probs)
+            if cumulative_probs[-1] == 0:
                 score = 0
                 break
-            available_probs_normalized = available_probs / available_probs_sum
-            idx = np.random.choice(len(available_teams), p=available_probs_normalized)
-            team = available_teams[idx]
+            idx = min(
+                np.searchsorted(cumulative_probs, self.rng.random() * cumulative_probs[-1], side="right"),
+                len(available_idxs) - 1,
+            )
             prob = available_probs[idx]
-            opponent = available_opponents[idx]
 
             remaining_weeks = n_weeks - week_indices[week] - 1
             max_possible_score = score * prob * (0.9**remaining_weeks)
-            if max_possible_score < best_score:
+            if max_possible_score < bound:
+                self.bound_pruned_counter += 1
                 score = 0
                 break
 
-            path.append((week, team, opponent, prob))
+            path[week_indices[week]] = available_idxs[idx]
             score *= prob
-            used_mask[team_to_idx[team]] = True
+            used_mask[available_idxs[idx]] = True
         return path, score
 
+    def candidates_fingerprint(self, weeks, candidates, used_teams):
+        digest = hashlib.sha256()
+        digest.update(repr((list(map(int, weeks)), sorted(used_teams))).encode())
+        for week in weeks:
+            teams, opponents, probs = candidates[week]
+            digest.update(",".join(map(str, teams)).encode())
+            digest.update(",".join(map(str, opponents)).encode())
+            digest.update(np.asarray(probs, dtype=float).tobytes())
+        return digest.hexdigest()
+
+    def save_checkpoint(self, next_sim, best_score, top_paths, fingerprint):
+        """
+        Save everything the Monte Carlo loop needs to continue exactly where it is:
+        RNG state, simulation counter, best score and every retained path. Paths
+        are stored as their team-ID rows, which the fingerprint ties to the
+        candidates they were sampled from.
+        """
+        os.makedirs(os.path.dirname(self.checkpoint_path), exist_ok=True)
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                fingerprint=fingerprint,
+                simulations=self.simulations,
+                next_sim=next_sim,
+                best_score=best_score,
+                rng_state=json.dumps(self.rng.bit_generator.state),
+                scores=top_paths.scores[: top_paths.size],
+                team_ids=top_paths.team_ids[: top_paths.size],
+                bound_pruned=self.bound_pruned_counter,
+                top_k_churn=np.array(self.top_k_churn, dtype=int),
+            )
+        # Replace in one step so a crash mid-write never leaves a broken checkpoint
+        os.replace(temp_path, self.checkpoint_path)
+
+    def load_checkpoint(self, top_paths, fingerprint):
+        with np.load(self.checkpoint_path) as checkpoint:
+            if str(checkpoint["fingerprint"]) != fingerprint or int(
+                checkpoint["simulations"]
+            ) != self.simulations:
+                raise ValueError(
+                    f"Checkpoint {self.checkpoint_path} was made with different candidates or "
+                    "number of simulations, delete it or run without resume."
+                )
+            self.rng.bit_generator.state = json.loads(str(checkpoint["rng_state"]))
+            self.bound_pruned_counter = int(checkpoint["bound_pruned"])
+            self.top_k_churn = checkpoint["top_k_churn"].tolist()
+
+            for score, row in zip(checkpoint["scores"], checkpoint["team_ids"]):
+                top_paths.add(score, row)
+            return int(checkpoint["next_sim"]), float(checkpoint["best_score"])
+
     def full_dfs(
         self,
         weekly_candidates,
@@ -142,14 +430,13 @@ class NFLSurvivorPickerMonteCarlo:
         score,
         best_score
     ):
+        self.full_dfs_node_counter += 1
         if week_idx == 19:
             self.full_dfs_counter += 1
             if score > 0:
-                self.full_dfs_top_paths.add((score, tuple(path)))
+                self.full_dfs_top_paths.add(score, np.array(path, dtype=np.int8))
                 if score > best_score:
                     best_score = score
-                if len(self.full_dfs_top_paths) > 5000:
-                    self.full_dfs_top_paths = set(sorted(self.full_dfs_top_paths, key=lambda x: -x[0])[:100])
                 
             return best_score
 
@@ -167,7 +454,7 @@ class NFLSurvivorPickerMonteCarlo:
             next_score = score * prob
 
             picked_teams.add(team)
-            new_path = path + [(week_idx, team, opponent, prob)]
+            new_path = path + [self.full_dfs_team_to_idx[team]]
 
             # Recurse
             best_score = self.full_dfs(
@@ -180,32 +467,27 @@ class NFLSurvivorPickerMonteCarlo:
         return best_score
 
 
-    def save_results(self, weeks, top_paths):
-        # Calculate team pick percentages per week
-        week_team_counts = {week: {} for week in weeks}
-        for _, path in top_paths:
-            for week, team, opponent, prob in path:
-                old_count = (
-                    week_team_counts[week].get(team)[0]
-                    if team in week_team_counts[week]
-                    else 0
-                )
-                week_team_counts[week][team] = [old_count + 1, opponent, prob]
-        
+    def save_results(self, top_paths):
+        # Calculate team pick percentages per week from the columnar path arrays
+        columns = encode_paths(top_paths)
+        team_ids = columns["team_ids"]
+        n_teams = len(columns["teams"])
+
         # Output formatted results
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         output_str = f"Top {len(top_paths)} Paths (generated at {timestamp}):\n"
-        for week in weeks:
-            if not week_team_counts[week]:
-                continue
-            total = sum(w[0] for w in week_team_counts[week].values())
+        for col, week in enumerate(columns["weeks"]):
+            counts = np.bincount(team_ids[:, col], minlength=n_teams)
+            picked, first_row = np.unique(team_ids[:, col], return_index=True)
+            # Most picked first, ties in order of first appearance among the top paths
+            order = np.lexsort((first_row, -counts[picked]))
             week_str = f"Week {week}: "
-            sorted_entries = sorted(
-                week_team_counts[week].items(), key=lambda item: -item[1][0]
-            )
             team_percents = [
-                f"{team} over {value[1]} ({int(value[0]/total*100)}% of paths, {int(value[2]*100)}% to win)"
-                for team, value in sorted_entries
+                f"{columns['teams'][team_id]} over "
+                f"{columns['teams'][columns['opponent_ids'][row, col]]} "
+                f"({int(counts[team_id]/len(top_paths)*100)}% of paths, "
+                f"{int(columns['win_probs'][row, col]*100)}% to win)"
+                for team_id, row in zip(picked[order], first_row[order])
             ]
             week_str += ", ".join(team_percents)
             output_str += week_str + "\n"
@@ -214,50 +496,70 @@ class NFLSurvivorPickerMonteCarlo:
         # Output best path as before
         best_score, best_path = top_paths[0]
 
-        previous_picks = [[k, v[0], v[2], v[1]] for k, v in ALREADY_CHOSEN_TEAMS.items()]
+        previous_picks = [[k, v[0], v[2], v[1]] for k, v in self.already_chosen_teams.items()]
 
         result = pd.DataFrame(
             previous_picks + list(best_path), columns=["week", "pick", "opponent", "win_prob"]
         )
 
-        week_folder = f"data/{'second_chance/' if SECOND_CHANCE_WEEK_START > 0 else 'first_chance/'}week{self.current_prediction_week}/{str(best_score).replace('.', '')[1:8]}"
+        week_folder = f"{self.get_week_folder()}/{str(best_score).replace('.', '')[1:8]}"
         os.makedirs(week_folder, exist_ok=True)
+        self.last_output_folder = week_folder
         output_csv_path = f"{week_folder}/picks.csv"
         result.to_csv(output_csv_path, index=False)
 
         # write output_str to a text file in the same folder
         with open(f"{week_folder}/weekly_options.txt", "w") as f:
             f.write(output_str)
+        np.savez_compressed(f"{week_folder}/paths.npz", **columns)
 
         print(result.to_string(index=False))
         return result
 
-    def precompute_weekly_candidates(self, weeks, used_teams):
+    def get_week_folder(self):
+        return f"data/{self.pool_name}/week{self.current_prediction_week}"
+
+    def precompute_weekly_candidates(self, weeks, used_teams, sides=None, forced_picks=True):
+        """
+        sides: candidate_sides of the probability table, to share one set of
+        arrays between pickers; computed from games_with_probs when not given
+        forced_picks: restrict weeks in choose_this_week to our forced pick.
+        Off for candidates that aren't ours, like the simulated field's
+        """
+        if sides is None:
+            sides = candidate_sides(self.games_with_probs, weeks)
+        used = np.array(sorted(used_teams), dtype=str)
         candidates = {}
         for week in weeks:
-            week_games = self.games_with_probs[self.games_with_probs["week"] == week]
-            if week in ALREADY_CHOSEN_TEAMS:
-                team, prob, opponent = ALREADY_CHOSEN_TEAMS[week]
-                teams, probs, opponents = [team], [prob], [opponent]
-            elif week in CHOOSE_THIS_WEEK:
-                team, prob, opponent = CHOOSE_THIS_WEEK[week]
-                teams, probs, opponents = [team], [prob], [opponent]
+            if week in self.already_chosen_teams or (forced_picks and week in self.choose_this_week):
+                team, prob, opponent = (
+                    self.already_chosen_teams[week]
+                    if week in self.already_chosen_teams
+                    else self.choose_this_week[week]
+                )
+                candidates[week] = (np.array([team]), np.array([opponent]), np.array([prob]))
+            elif week in sides:
+                teams, opponents, probs = sides[week]
+                keep = (probs > self.candidate_threshold) & ~np.isin(teams, used)
+                candidates[week] = (teams[keep], opponents[keep], probs[keep])
             else:
-                teams, probs, opponents = [], [], []
-                for _, row in week_games.iterrows():
-                    if row["home_win_prob"] > 0.6 and row["home_team"] not in used_teams:
-                        teams.append(row["home_team"])
-                        probs.append(row["home_win_prob"])
-                        opponents.append(row["away_team"])
-                    if row["away_win_prob"] > 0.6 and row["away_team"] not in used_teams:
-                        teams.append(row["away_team"])
-                        probs.append(row["away_win_prob"])
-                        opponents.append(row.home_team)
-
-            candidates[week] = (np.array(teams), np.array(opponents), np.array(probs))
+                candidates[week] = (np.array([], dtype=str), np.array([], dtype=str), np.array([]))
 
         return candidates
 
 
-picker = NFLSurvivorPickerMonteCarlo(simulations=NUM_SIMULATIONS)
-survivor_picks = picker.do_monte_carlo_simulations()
+def main(
+    simulations=NUM_SIMULATIONS, profile_search=False, seed=None, resume=False, strength_model=STRENGTH_MODEL
+):
+    picker = NFLSurvivorPickerMonteCarlo(
+        simulations=simulations,
+        profile_search=profile_search,
+        seed=seed,
+        resume=resume,
+        strength_model=strength_model,
+    )
+    return picker.do_monte_carlo_simulations()
+
+
+if __name__ == "__main__":
+    main()
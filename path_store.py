@@ -0,0 +1,86 @@
+import numpy as np
+
+
+class TopPathStore:
+    def __init__(self, n_weeks, keep, capacity=5000):
+        """
+        Retained search paths as fixed-width int8 team-ID rows with float64 scores,
+        both preallocated. Once more than `capacity` paths are held, only the best
+        `keep` survive. floor is the worst kept score at the last trim, a lower
+        bound on the final keep-th best score (0 before the first trim).
+        """
+        self.n_weeks = n_weeks
+        self.keep = keep
+        self.capacity = capacity
+        self.team_ids = np.empty((capacity + 1, n_weeks), dtype=np.int8)
+        self.scores = np.empty(capacity + 1, dtype=np.float64)
+        self.size = 0
+        self.floor = 0.0
+        self.seen = set()  # row bytes, for dedup
+
+    def __len__(self):
+        return self.size
+
+    def add(self, score, team_ids):
+        key = team_ids.tobytes()
+        if key in self.seen:
+            return
+        self.seen.add(key)
+        self.team_ids[self.size] = team_ids
+        self.scores[self.size] = score
+        self.size += 1
+        if self.size > self.capacity:
+            self.trim(self.keep)
+
+    def order(self):
+        """
+        Row indices best score first. Ties are broken by the team IDs themselves,
+        so the order never depends on insertion order.
+        """
+        rows = self.team_ids[: self.size]
+        keys = [rows[:, col] for col in reversed(range(self.n_weeks))]
+        return np.lexsort(keys + [-self.scores[: self.size]])
+
+    def trim(self, keep):
+        best = self.order()[:keep]
+        self.team_ids[: len(best)] = self.team_ids[best]
+        self.scores[: len(best)] = self.scores[best]
+        self.size = len(best)
+        if self.size >= keep:
+            self.floor = float(self.scores[self.size - 1])
+        self.seen = {row.tobytes() for row in self.team_ids[: self.size]}
+
+    def sorted_arrays(self, limit=None):
+        best = self.order()[:limit]
+        return self.scores[best], self.team_ids[best]
+
+
+def encode_paths(top_paths):
+    """
+    Columnar form of (score, path) tuples, all paths covering the same weeks.
+    Returns a dict of arrays: scores, weeks, teams (ID -> name), team_ids and
+    opponent_ids as int8 and win_probs, one row per path.
+    """
+    weeks = np.array([week for week, _, _, _ in top_paths[0][1]]) if top_paths else np.array([], dtype=int)
+    teams = np.unique(
+        [team for _, path in top_paths for _, team, opponent, _ in path]
+        + [opponent for _, path in top_paths for _, _, opponent, _ in path]
+    ).astype(str)
+    team_to_idx = {team: i for i, team in enumerate(teams)}
+    shape = (len(top_paths), len(weeks))
+    team_ids = np.empty(shape, dtype=np.int8)
+    opponent_ids = np.empty(shape, dtype=np.int8)
+    win_probs = np.empty(shape, dtype=np.float64)
+    for row, (_, path) in enumerate(top_paths):
+        for col, (_, team, opponent, prob) in enumerate(path):
+            team_ids[row, col] = team_to_idx[team]
+            opponent_ids[row, col] = team_to_idx[opponent]
+            win_probs[row, col] = prob
+    return {
+        "scores": np.array([score for score, _ in top_paths], dtype=np.float64),
+        "weeks": weeks,
+        "teams": teams,
+        "team_ids": team_ids,
+        "opponent_ids": opponent_ids,
+        "win_probs": win_probs,
+    }
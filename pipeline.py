@@ -0,0 +1,286 @@
+"""
+Weekly workflow as a small DAG: scrape standings / scrape results -> predict -> plan.
+
+Each stage declares the files it reads and writes plus any other values it
+depends on, and is fingerprinted by their content. A stage only reruns when its
+fingerprint changed since its last successful run or one of its outputs was
+modified since. Stages whose dependencies are done run in parallel.
+"""
+import ast
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from constants import (
+    SCHEDULE_CSV_PATH,
+    SCHEDULE_WITH_PROBABILITIES_PATH,
+    FULL_CALC_CSV_PATH,
+    PROJECTED_WINS_CSV_PATH,
+    GAME_RESULTS_CSV_PATH,
+    ADJUSTMENTS_MODULE_PATH,
+)
+from run_archive import hash_file
+
+PIPELINE_CACHE_PATH = "data/pipeline_cache.json"
+# Picks made so far live in the adjustments module but don't affect predictions
+PICK_STATE_NAMES = {"ALREADY_CHOSEN_TEAMS", "PORTFOLIO_ENTRIES"}
+
+
+def adjustments_fingerprint(path=ADJUSTMENTS_MODULE_PATH):
+    """
+    Hash of the adjustments module without the pick lists. Comments and
+    formatting don't count either, since the parsed code is hashed.
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    tree.body = [
+        node
+        for node in tree.body
+        if not (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id in PICK_STATE_NAMES for t in node.targets)
+        )
+    ]
+    return hashlib.sha256(ast.dump(tree).encode()).hexdigest()[:16]
+
+
+class Stage:
+    def __init__(self, name, run, inputs=(), outputs=(), depends_on=(), params=None):
+        """
+        run: called with no arguments, may return a list of extra output paths
+        (for outputs whose names are only known after running)
+        inputs: files the stage reads, hashed by content
+        outputs: files the stage writes
+        params: optional callable returning any other values the stage depends
+        on; its repr is hashed
+        """
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.depends_on = list(depends_on)
+        self.params = params
+
+    def fingerprint(self):
+        digest = hashlib.sha256(self.name.encode())
+        for path in self.inputs:
+            digest.update(f"{path}:{hash_file(path)}".encode())
+        if self.params:
+            digest.update(repr(self.params()).encode())
+        return digest.hexdigest()[:16]
+
+
+class Pipeline:
+    def __init__(self, stages, cache_path=PIPELINE_CACHE_PATH, max_workers=4):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+        self.cache = {}
+        if os.path.exists(cache_path):
+            with open(cache_path) as f:
+                self.cache = json.load(f)
+        self._lock = threading.Lock()
+        self.check_graph()
+
+    def check_graph(self):
+        for stage in self.stages.values():
+            unknown = set(stage.depends_on) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {sorted(unknown)}")
+
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a dependency cycle through {name}")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.remove(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def is_fresh(self, stage, fingerprint):
+        entry = self.cache.get(stage.name)
+        if not entry or entry["fingerprint"] != fingerprint:
+            return False
+        return all(hash_file(path) == digest for path, digest in entry["outputs"].items())
+
+    def run_stage(self, stage, force):
+        """Runs one stage if needed. Returns "ran" or "cached"."""
+        fingerprint = stage.fingerprint()
+        if stage.name not in force and self.is_fresh(stage, fingerprint):
+            print(f"[{stage.name}] up to date, skipping")
+            return "cached"
+
+        print(f"[{stage.name}] running")
+        extra_outputs = stage.run() or []
+        outputs = {path: hash_file(path) for path in stage.outputs + list(extra_outputs)}
+        with self._lock:
+            self.cache[stage.name] = {"fingerprint": fingerprint, "outputs": outputs}
+            self.save_cache()
+        return "ran"
+
+    def save_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.cache, f, indent=2)
+        os.replace(temp_path, self.cache_path)
+
+    def run(self, force=()):
+        """
+        Run every stage whose fingerprint changed, dependencies first, submitting
+        each stage as soon as its dependencies finish. force: stage names to run
+        regardless. Returns {stage name: "ran" or "cached"}.
+        """
+        force = set(force)
+        unknown = force - set(self.stages)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)}")
+
+        status = {}
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while len(status) < len(self.stages):
+                for name, stage in self.stages.items():
+                    if name in status or name in running.values():
+                        continue
+                    if all(dependency in status for dependency in stage.depends_on):
+                        running[executor.submit(self.run_stage, stage, force)] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    # Re-raises the stage's error; stages not started yet never run
+                    status[running.pop(future)] = future.result()
+        return status
+
+
+def build_weekly_pipeline(
+    simulations=None,
+    seed=None,
+    scrape=True,
+    first_week=1,
+    last_week=None,
+    season=2025,
+    strength_model=None,
+):
+    """
+    The weekly workflow. Scrape stages fetch live data, so their fingerprint
+    includes today's date: they run at most once a day unless forced.
+    strength_model: team strength model (default: STRENGTH_MODEL in win_predictor.py)
+    """
+    import nfl_survivor_assistant_monte_carlo as planner
+    from win_predictor import STRENGTH_MODEL
+    from win_predictor_adjustments_helper import ALREADY_CHOSEN_TEAMS
+
+    week = planner.get_current_prediction_week()
+    simulations = planner.NUM_SIMULATIONS if simulations is None else simulations
+    last_week = week - 1 if last_week is None else last_week
+    strength_model = STRENGTH_MODEL if strength_model is None else strength_model
+
+    def scrape_standings():
+        from team_win_scraper import TeamWinScraper
+
+        TeamWinScraper.update_wins_column_in_csv(PROJECTED_WINS_CSV_PATH)
+
+    def scrape_results():
+        import game_win_scraper
+
+        game_win_scraper.main(first_week, last_week, season)
+
+    def predict():
+        from win_predictor import NFLWinPredictor
+
+        NFLWinPredictor(week, False, strength_model).add_win_probabilities_to_csv()
+
+    def plan():
+        import pandas as pd
+
+        picker = planner.NFLSurvivorPickerMonteCarlo(
+            simulations,
+            games_with_probs=pd.read_csv(SCHEDULE_WITH_PROBABILITIES_PATH),
+            seed=seed,
+        )
+        if planner.ROBUST_RANKING:
+            from win_predictor import NFLWinPredictor
+
+            # Robust re-ranking perturbs the predictor's game scores
+            picker.game_predictor = NFLWinPredictor(week, False, strength_model)
+        picker.do_monte_carlo_simulations()
+        return [
+            f"{picker.last_output_folder}/{name}"
+            for name in ("picks.csv", "weekly_options.txt", "paths.npz")
+        ]
+
+    stages = []
+    if scrape:
+        stages += [
+            Stage(
+                "scrape_standings",
+                scrape_standings,
+                outputs=[PROJECTED_WINS_CSV_PATH],
+                params=lambda: date.today().isoformat(),
+            ),
+            Stage(
+                "scrape_results",
+                scrape_results,
+                outputs=[GAME_RESULTS_CSV_PATH],
+                params=lambda: (date.today().isoformat(), first_week, last_week, season),
+            ),
+        ]
+    predict_inputs = [PROJECTED_WINS_CSV_PATH, SCHEDULE_CSV_PATH, "win_predictor.py", "schedule_validator.py"]
+    predict_depends_on = ["scrape_standings"] if scrape else []
+    if strength_model == "elo":
+        # Ratings are built from the game results
+        predict_inputs += [GAME_RESULTS_CSV_PATH, "team_ratings.py"]
+        predict_depends_on += ["scrape_results"] if scrape else []
+    stages += [
+        Stage(
+            "predict",
+            predict,
+            inputs=predict_inputs,
+            outputs=[SCHEDULE_WITH_PROBABILITIES_PATH, FULL_CALC_CSV_PATH],
+            depends_on=predict_depends_on,
+            params=lambda: (week, strength_model, adjustments_fingerprint()),
+        ),
+        Stage(
+            "plan",
+            plan,
+            inputs=[
+                SCHEDULE_WITH_PROBABILITIES_PATH,
+                "nfl_survivor_assistant_monte_carlo.py",
+                "candidate_pruner.py",
+                "path_store.py",
+                "robust_planner.py",
+            ],
+            depends_on=["predict"],
+            params=lambda: (
+                sorted(ALREADY_CHOSEN_TEAMS.items()),
+                sorted(planner.CHOOSE_THIS_WEEK.items()),
+                simulations,
+                seed,
+                planner.SECOND_CHANCE_WEEK_START,
+                planner.CANDIDATE_WIN_PROB_THRESHOLD,
+                planner.TOP_PATHS_TO_KEEP,
+                planner.ROBUST_RANKING,
+                planner.ROBUST_CANDIDATE_PATHS,
+            ),
+        ),
+    ]
+    return Pipeline(stages)
+
+
+def main(force=(), **pipeline_args):
+    status = build_weekly_pipeline(**pipeline_args).run(force)
+    print(", ".join(f"{name}: {result}" for name, result in status.items()))
+    return status
+
+
+if __name__ == "__main__":
+    main()
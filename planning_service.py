@@ -0,0 +1,363 @@
+"""
+Local planning service: python cli.py serve [--port 8765]
+
+Keeps the schedule, compiled adjustments, probabilities and weekly candidates in
+memory and answers what-if questions over a JSON API on localhost:
+
+    GET  /state                        current week, locks and overrides
+    GET  /paths?k=10                   top k paths, 1 <= k <= TOP_PATHS_TO_KEEP
+    GET  /pick-values?week=15          best path survival with each pick that week
+    POST /lock       {"week": 15, "team": "DEN"}
+    POST /unlock     {"week": 15}
+    POST /overrides  {"INJURY_ADJUSTMENTS": {"PIT": [[11, 13, -2.0]]}}
+
+Overrides use the compile_adjustments format and replace the previous ones
+({} goes back to the helper file). Changes only rescore the games and rebuild
+the candidates of the weeks they touch.
+"""
+import contextlib
+import io
+import json
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pandas as pd
+from candidate_pruner import CandidatePruner
+from win_predictor import NFLWinPredictor
+from win_predictor_adjustments_helper import ALREADY_CHOSEN_TEAMS, compile_adjustments
+from nfl_survivor_assistant_monte_carlo import (
+    NFLSurvivorPickerMonteCarlo,
+    TOP_PATHS_TO_KEEP,
+    get_current_prediction_week,
+)
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+# Partial paths kept per week when too many weeks remain for the full DFS
+SERVICE_BEAM_WIDTH = 2000
+
+
+class PlanningState:
+    def __init__(self, already_chosen_teams=ALREADY_CHOSEN_TEAMS):
+        self.already_chosen_teams = already_chosen_teams
+        self.week = get_current_prediction_week(already_chosen_teams)
+        self.predictor = NFLWinPredictor(self.week, False)
+        (
+            self.schedule,
+            self.teams,
+            self.home,
+            self.away,
+            self.game_weeks,
+        ) = self.predictor.game_arrays()
+        self.max_week = max(self.game_weeks.max(), 18)
+        self.overrides = {}
+        self.compiled = compile_adjustments(self.teams, self.max_week)
+        home_probs, away_probs = self.predictor.batch_probability_arrays(
+            [self.compiled], self.home, self.away, self.game_weeks
+        )
+        self.home_probs, self.away_probs = home_probs[0], away_probs[0]
+
+        self.picker = NFLSurvivorPickerMonteCarlo(
+            0, games_with_probs=self.probability_table(), already_chosen_teams=already_chosen_teams
+        )
+        self.weeks = [int(week) for week in self.picker.get_search_weeks()]
+        self.used_teams = self.picker.get_used_teams()
+        self.locks = {}
+        self.base_candidates = self.picker.precompute_weekly_candidates(self.weeks, self.used_teams)
+        self.candidates = dict(self.base_candidates)
+        self.search_cache = {}
+        # Last top paths returned, rescored to warm-start the next search
+        self.last_paths = []
+
+    def probability_table(self):
+        return pd.DataFrame(
+            {
+                "week": self.game_weeks,
+                "home_team": self.schedule["home_team"].to_numpy(),
+                "away_team": self.schedule["away_team"].to_numpy(),
+                "home_win_prob": self.home_probs,
+                "away_win_prob": self.away_probs,
+            }
+        )
+
+    def changed_team_weeks(self, old, new):
+        """(n_teams, max_week + 1) mask of the team-weeks whose adjustments differ."""
+        changed = old["injuries"] != new["injuries"]
+        for name in ("momentum", "upset_riskiness", "home_team", "avoid_in_week_18", "division_ids"):
+            changed |= (old[name] != new[name])[:, None]
+        return changed
+
+    def set_overrides(self, overrides):
+        """Rescore only the games involving a changed team-week. Returns the affected weeks."""
+        compiled = compile_adjustments(self.teams, self.max_week, overrides)
+        self.overrides = overrides
+        return self.rescore(self.changed_team_weeks(self.compiled, compiled), compiled)
+
+    def refresh_inputs(self, rescore_all=False):
+        """
+        Re-read projected wins and recompile the adjustment tables (after the
+        helper module was reloaded), then rescore the games of every team whose
+        strength or adjustments changed. rescore_all: something every game
+        depends on changed. Returns the affected weeks.
+        """
+        predictor = NFLWinPredictor(self.week, False)
+        compiled = compile_adjustments(self.teams, self.max_week, self.overrides)
+        changed = self.changed_team_weeks(self.compiled, compiled)
+        changed |= np.array(
+            [predictor.team_wins[team] != self.predictor.team_wins[team] for team in self.teams]
+        )[:, None]
+        if rescore_all:
+            changed[:] = True
+        self.predictor = predictor
+        return self.rescore(changed, compiled)
+
+    def rescore(self, changed, compiled):
+        games = np.flatnonzero(
+            changed[self.home, self.game_weeks] | changed[self.away, self.game_weeks]
+        )
+        if len(games):
+            home_probs, away_probs = self.predictor.batch_probability_arrays(
+                [compiled], self.home[games], self.away[games], self.game_weeks[games]
+            )
+            self.home_probs[games] = home_probs[0]
+            self.away_probs[games] = away_probs[0]
+        self.compiled = compiled
+        weeks = sorted(set(self.game_weeks[games].tolist()) & set(self.weeks))
+        self.refresh_weeks(weeks)
+        return weeks
+
+    def refresh_weeks(self, weeks):
+        if not weeks:
+            return
+        self.picker.games_with_probs = self.probability_table()
+        self.base_candidates.update(self.picker.precompute_weekly_candidates(weeks, self.used_teams))
+        for week in weeks:
+            self.candidates[week] = (
+                self.locked_candidate(week, self.locks[week])
+                if week in self.locks
+                else self.base_candidates[week]
+            )
+        self.search_cache = {}
+
+    def locked_candidate(self, week, team):
+        in_week = self.game_weeks == week
+        for side, other, probs in (
+            (self.home, self.away, self.home_probs),
+            (self.away, self.home, self.away_probs),
+        ):
+            games = np.flatnonzero(in_week & (side == self.teams.index(team)))
+            if len(games):
+                game = games[0]
+                return (
+                    np.array([team]),
+                    np.array([self.teams[other[game]]]),
+                    np.array([probs[game]]),
+                )
+        raise ValueError(f"{team} does not play in week {week}")
+
+    def lock(self, week, team):
+        if week not in self.weeks or week in self.already_chosen_teams:
+            raise ValueError(f"Week {week} is not an open week ({self.weeks})")
+        if team not in self.teams:
+            raise ValueError(f"Unknown team {team}")
+        if team in self.used_teams:
+            raise ValueError(f"{team} was already used")
+        locked_elsewhere = [w for w, t in self.locks.items() if t == team and w != week]
+        if locked_elsewhere:
+            raise ValueError(f"{team} is already locked in week {locked_elsewhere[0]}")
+        self.locked_candidate(week, team)
+        self.locks[week] = team
+        self.refresh_weeks([week])
+        return [week]
+
+    def unlock(self, week):
+        if week not in self.locks:
+            raise ValueError(f"No lock in week {week}")
+        del self.locks[week]
+        self.refresh_weeks([week])
+        return [week]
+
+    def search(self, candidates, k, warm_paths=()):
+        """
+        Top k (score, path) tuples: the planner's full DFS when it applies,
+        otherwise a beam search, which only returns feasible paths but may miss
+        some of the true top k. warm_paths: feasible paths already scored
+        against `candidates`, used to tighten pruning and merged into beam
+        results.
+        """
+        # The planner and pruner report progress with print, not needed here
+        with contextlib.redirect_stdout(io.StringIO()):
+            pruned = CandidatePruner(k).prune(
+                candidates, self.weeks, known_scores=[score for score, _ in warm_paths]
+            )
+            if len(self.weeks) < 6:
+                return self.picker.search(self.weeks, pruned, self.used_teams)[:k]
+            beam = CandidatePruner(k).beam_search(pruned, self.weeks, max(SERVICE_BEAM_WIDTH, k))
+        found = {
+            tuple(
+                (week, pruned[week][0][i], pruned[week][1][i], pruned[week][2][i])
+                for week, i in zip(self.weeks, picks)
+            ): score
+            for score, picks in beam
+        }
+        for score, path in warm_paths:
+            found.setdefault(path, score)
+        return sorted(((score, path) for path, score in found.items()), key=lambda x: -x[0])[:k]
+
+    def rescore_paths(self, paths):
+        """Score paths against the current candidates, dropping any no longer possible."""
+        lookup = {
+            week: {team: (opponent, prob) for team, opponent, prob in zip(*self.candidates[week])}
+            for week in self.weeks
+        }
+        rescored = []
+        for _, path in paths:
+            if [week for week, _, _, _ in path] != self.weeks:
+                continue
+            if not all(team in lookup[week] for week, team, _, _ in path):
+                continue
+            new_path = tuple((week, team, *lookup[week][team]) for week, team, _, _ in path)
+            score = 1.0
+            for _, _, _, prob in new_path:
+                score *= prob
+            rescored.append((score, new_path))
+        return rescored
+
+    def top_paths(self, k=TOP_PATHS_TO_KEEP):
+        """
+        Top k paths, k between 1 and TOP_PATHS_TO_KEEP. The full DFS never keeps
+        more than that, so beam searches are capped the same way.
+        """
+        if not 1 <= k <= TOP_PATHS_TO_KEEP:
+            raise ValueError(f"k must be between 1 and {TOP_PATHS_TO_KEEP}, got {k}")
+        if k not in self.search_cache:
+            self.search_cache[k] = self.search(
+                self.candidates, k, warm_paths=self.rescore_paths(self.last_paths)
+            )
+            self.last_paths = self.search_cache[k]
+        return self.search_cache[k]
+
+    def pick_values(self, week):
+        """
+        For every candidate pick in `week`: the best path survival with that pick
+        locked, and the share of the current top paths that make it.
+        """
+        if week not in self.weeks:
+            raise ValueError(f"Week {week} is not an open week ({self.weeks})")
+        top = self.top_paths()
+        values = []
+        for team, opponent, prob in zip(*self.candidates[week]):
+            with_pick = dict(self.candidates)
+            with_pick[week] = (np.array([team]), np.array([opponent]), np.array([prob]))
+            best = self.search(with_pick, 1)
+            values.append(
+                {
+                    "team": str(team),
+                    "opponent": str(opponent),
+                    "win_prob": float(prob),
+                    "best_survival": float(best[0][0]) if best else 0.0,
+                    "share_of_top_paths": sum(
+                        1 for _, path in top if any(w == week and t == team for w, t, _, _ in path)
+                    )
+                    / max(len(top), 1),
+                }
+            )
+        return sorted(values, key=lambda value: -value["best_survival"])
+
+    def describe(self):
+        return {
+            "week": int(self.week),
+            "search_weeks": [int(week) for week in self.weeks],
+            "locks": {str(week): team for week, team in sorted(self.locks.items())},
+            "overrides": self.overrides,
+            "candidates": {
+                str(week): [str(team) for team in self.candidates[week][0]] for week in self.weeks
+            },
+        }
+
+
+def paths_to_json(top_paths):
+    return [
+        {
+            "survival": float(score),
+            "picks": [
+                {"week": int(week), "team": str(team), "opponent": str(opponent), "win_prob": float(prob)}
+                for week, team, opponent, prob in path
+            ],
+        }
+        for score, path in top_paths
+    ]
+
+
+class PlanningRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        state = self.server.state
+        self.dispatch(
+            {
+                "/state": lambda query: state.describe(),
+                "/paths": lambda query: {
+                    "paths": paths_to_json(state.top_paths(int(query.get("k", 10))))
+                },
+                "/pick-values": lambda query: {
+                    "week": int(query.get("week", state.weeks[0])),
+                    "values": state.pick_values(int(query.get("week", state.weeks[0]))),
+                },
+            }
+        )
+
+    def do_POST(self):
+        state = self.server.state
+        self.dispatch(
+            {
+                "/lock": lambda body: {
+                    "recomputed_weeks": state.lock(int(body["week"]), body["team"])
+                },
+                "/unlock": lambda body: {"recomputed_weeks": state.unlock(int(body["week"]))},
+                "/overrides": lambda body: {"recomputed_weeks": state.set_overrides(body)},
+            },
+            read_body=True,
+        )
+
+    def dispatch(self, routes, read_body=False):
+        url = urlparse(self.path)
+        route = routes.get(url.path)
+        if route is None:
+            return self.send_json(404, {"error": f"Unknown endpoint {url.path}"})
+        start = time.perf_counter()
+        try:
+            if read_body:
+                length = int(self.headers.get("Content-Length", 0))
+                argument = json.loads(self.rfile.read(length) or b"{}")
+            else:
+                argument = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            response = route(argument)
+        except (ValueError, KeyError, TypeError) as e:
+            return self.send_json(400, {"error": str(e)})
+        response["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self.send_json(200, response)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host=SERVICE_HOST, port=SERVICE_PORT, state=None):
+    """Requests are handled one at a time, so the state never needs locking."""
+    server = HTTPServer((host, port), PlanningRequestHandler)
+    server.state = state or PlanningState()
+    print(f"Planning service for week {server.state.week} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,146 @@
+"""
+Plan several pools with different rules in one run: python cli.py pools
+
+Pools can start in different weeks (first vs second chance), require different
+win probabilities before a pick is considered, and have used different teams.
+The probability table and both sides of every game are computed once; each
+pool's candidates are masks over those shared arrays. The searches run in
+parallel and each pool's results go to data/<pool>/weekN.
+"""
+import pandas as pd
+from win_predictor_adjustments_helper import ALREADY_CHOSEN_TEAMS
+from nfl_survivor_assistant_monte_carlo import (
+    NFLSurvivorPickerMonteCarlo,
+    CHOOSE_THIS_WEEK,
+    SHOULD_SCRAPE_CURRENT_WINS,
+    SECOND_CHANCE_WEEK_START,
+    CANDIDATE_WIN_PROB_THRESHOLD,
+    candidate_sides,
+    get_current_prediction_week,
+    predict_weeks,
+)
+from worker_pool import map_on_workers, worker_inputs
+
+POOL_SIMULATIONS = 1_000_000
+
+# Pool name -> rules. start_week: first week of the pool (0 for a season-long
+# pool), candidate_threshold: minimum win probability for a pick,
+# already_chosen_teams: picks made so far, same format as ALREADY_CHOSEN_TEAMS,
+# choose_this_week: optional picks to force in open weeks, same format as
+# CHOOSE_THIS_WEEK (none by default)
+POOLS = {
+    "second_chance": {
+        "start_week": SECOND_CHANCE_WEEK_START,
+        "candidate_threshold": CANDIDATE_WIN_PROB_THRESHOLD,
+        "already_chosen_teams": ALREADY_CHOSEN_TEAMS,
+        "choose_this_week": CHOOSE_THIS_WEEK,
+    },
+    # "office": {
+    #     "start_week": 0,
+    #     "candidate_threshold": 0.55,
+    #     "already_chosen_teams": {1: ["DEN", 1.0, "TEN"], 2: ["BUF", 1.0, "NYJ"]},
+    # },
+}
+
+def _make_picker(name, pool, simulations, games, seed=None):
+    return NFLSurvivorPickerMonteCarlo(
+        simulations,
+        games_with_probs=games,
+        already_chosen_teams=pool["already_chosen_teams"],
+        choose_this_week=pool.get("choose_this_week", {}),
+        seed=seed,
+        start_week=pool.get("start_week", SECOND_CHANCE_WEEK_START),
+        candidate_threshold=pool.get("candidate_threshold", CANDIDATE_WIN_PROB_THRESHOLD),
+        pool_name=name,
+    )
+
+
+def _run_pool(name):
+    picker = _make_picker(
+        name,
+        worker_inputs["pools"][name],
+        worker_inputs["simulations"],
+        worker_inputs["games"],
+        worker_inputs["seed"],
+    )
+    top_paths = picker.search(
+        picker.get_search_weeks(), worker_inputs["candidates"][name], picker.get_used_teams()
+    )
+    # The full DFS sets simulations to 0, report what actually ran
+    return name, top_paths, picker.search_strategy(), picker.simulations
+
+
+class PoolBatchPlanner:
+    def __init__(self, pools=POOLS, simulations=POOL_SIMULATIONS, max_workers=None, seed=None):
+        """
+        pools: dict of pool name -> rules (see POOLS)
+        simulations: Monte Carlo simulations per pool
+        max_workers: worker processes for the searches (defaults to CPU count)
+        """
+        self.pools = pools
+        self.simulations = simulations
+        self.max_workers = max_workers
+        self.seed = seed
+
+    def run(self):
+        """
+        Predict once with team strength as of the latest pool's week, keeping
+        every game from the earliest week any pool still needs, build every
+        pool's candidates from the shared game sides, then search the pools on a
+        worker pool and save each one's results to its own folder. Returns a
+        DataFrame with each pool's best path and survival probability.
+        """
+        names = list(self.pools)
+        pool_weeks = [
+            get_current_prediction_week(
+                self.pools[n]["already_chosen_teams"],
+                self.pools[n].get("start_week", SECOND_CHANCE_WEEK_START),
+            )
+            for n in names
+        ]
+        games = predict_weeks(min(pool_weeks), max(pool_weeks), SHOULD_SCRAPE_CURRENT_WINS)
+        sides = candidate_sides(games)
+
+        pickers, candidates = {}, {}
+        for name in names:
+            print(f"Pool '{name}':")
+            picker = _make_picker(name, self.pools[name], self.simulations, games, self.seed)
+            candidates[name] = picker.build_candidates(
+                picker.get_search_weeks(), picker.get_used_teams(), sides
+            )
+            pickers[name] = picker
+
+        shared = {
+            "pools": self.pools,
+            "simulations": self.simulations,
+            "games": games,
+            "seed": self.seed,
+            "candidates": candidates,
+        }
+        results = {
+            name: result for name, *result in map_on_workers(_run_pool, names, shared, self.max_workers)
+        }
+
+        rows = []
+        for name in names:
+            picker = pickers[name]
+            top_paths, strategy, picker.simulations = results[name]
+            row = {"pool": name, "week": picker.current_prediction_week, "survival": 0.0}
+            if top_paths:
+                print(f"Pool '{name}', week {picker.current_prediction_week}:")
+                picker.save_results(top_paths)
+                picker.archive_run(top_paths, strategy)
+                row["survival"] = top_paths[0][0]
+                row["pick"] = top_paths[0][1][0][1]
+                row["folder"] = picker.last_output_folder
+            else:
+                print(f"Pool '{name}': no surviving path with the current candidates")
+            rows.append(row)
+
+        summary = pd.DataFrame(rows)
+        print(summary.to_string(index=False))
+        return summary
+
+
+if __name__ == "__main__":
+    PoolBatchPlanner().run()
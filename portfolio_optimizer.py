@@ -0,0 +1,142 @@
+import os
+import numpy as np
+import pandas as pd
+from win_predictor_adjustments_helper import PORTFOLIO_ENTRIES
+from robust_planner import build_pick_index, build_path_incidence
+from nfl_survivor_assistant_monte_carlo import (
+    NFLSurvivorPickerMonteCarlo,
+    SHOULD_SCRAPE_CURRENT_WINS,
+    get_current_prediction_week,
+    predict_weeks,
+)
+
+PORTFOLIO_SIMULATIONS = 1_000_000
+PORTFOLIO_OUTCOME_SAMPLES = 20_000
+# "any_survives": maximize P(at least one entry survives)
+# "expected_survivors": maximize expected number of surviving entries
+PORTFOLIO_OBJECTIVE = "any_survives"
+
+
+class PortfolioOptimizer:
+    def __init__(
+        self,
+        entries=PORTFOLIO_ENTRIES,
+        objective=PORTFOLIO_OBJECTIVE,
+        simulations=PORTFOLIO_SIMULATIONS,
+        outcome_samples=PORTFOLIO_OUTCOME_SAMPLES,
+        seed=None,
+    ):
+        """
+        entries: dict of entry name -> already chosen teams for that entry
+        simulations: Monte Carlo simulations per entry to find candidate paths
+        outcome_samples: simulated seasons shared by all entries
+        """
+        if objective not in ("any_survives", "expected_survivors"):
+            raise ValueError(f"Unknown portfolio objective: {objective}")
+        self.entries = entries
+        self.objective = objective
+        self.simulations = simulations
+        self.outcome_samples = outcome_samples
+        self.rng = np.random.default_rng(seed)
+
+    def run(self):
+        """
+        Find candidate paths for every entry, simulate game outcomes shared by all
+        entries, then choose one path per entry jointly. Returns a DataFrame with
+        each entry's chosen path and survival probability.
+        """
+        names = list(self.entries)
+        entry_weeks = [get_current_prediction_week(self.entries[n]) for n in names]
+        # Strength as of the entry furthest along, games from the one furthest behind
+        games = predict_weeks(min(entry_weeks), max(entry_weeks), SHOULD_SCRAPE_CURRENT_WINS)
+
+        entry_paths = {}
+        for name in names:
+            print(f"Entry '{name}':")
+            picker = NFLSurvivorPickerMonteCarlo(
+                self.simulations, games_with_probs=games, already_chosen_teams=self.entries[name]
+            )
+            weeks = picker.get_search_weeks()
+            used_teams = picker.get_used_teams()
+            candidates = picker.build_candidates(weeks, used_teams)
+            entry_paths[name] = picker.search(weeks, candidates, used_teams)
+            if not entry_paths[name]:
+                raise ValueError(f"No surviving path found for entry '{name}'")
+
+        pick_index = build_pick_index(games["week"], games["home_team"], games["away_team"])
+        pick_losses = self.simulate_pick_losses(games)
+
+        # survival[name] is (n_paths, outcome_samples): does the path survive that season
+        survival = {}
+        for name in names:
+            paths = [path for _, path in entry_paths[name]]
+            incidence = build_path_incidence(paths, pick_index, dtype=np.float32)
+            survival[name] = (incidence @ pick_losses) == 0
+
+        choice = self.choose_paths(names, survival)
+
+        rows = []
+        alive = np.zeros(self.outcome_samples, dtype=bool)
+        for name in names:
+            _, path = entry_paths[name][choice[name]]
+            entry_survival = survival[name][choice[name]]
+            alive |= entry_survival
+            row = {"entry": name, "survival": entry_survival.mean()}
+            for week, team, opponent, _ in path:
+                row[f"week {week}"] = f"{team} over {opponent}"
+            rows.append(row)
+        result = pd.DataFrame(rows)
+
+        print(result.to_string(index=False))
+        print(
+            f"P(at least one entry survives): {round(alive.mean() * 100, 3)}%, "
+            f"expected surviving entries: {round(result['survival'].sum(), 3)}"
+        )
+        week_folder = picker.get_week_folder()
+        os.makedirs(week_folder, exist_ok=True)
+        result.to_csv(f"{week_folder}/portfolio.csv", index=False)
+        return result
+
+    def simulate_pick_losses(self, games):
+        """
+        Simulate every game outcome_samples times. Returns an (n_picks, outcome_samples)
+        float32 matrix that is 1 where the pick lost, in build_pick_index column order.
+        """
+        draws = self.rng.random((len(games), self.outcome_samples))
+        home_wins = draws < games["home_win_prob"].to_numpy()[:, None]
+        away_wins = draws >= 1 - games["away_win_prob"].to_numpy()[:, None]
+        pick_losses = np.empty((2 * len(games), self.outcome_samples), dtype=np.float32)
+        pick_losses[0::2] = ~home_wins
+        pick_losses[1::2] = ~away_wins
+        return pick_losses
+
+    def choose_paths(self, names, survival):
+        """
+        Pick one path index per entry. Expected survivors is separable, so each
+        entry takes its own best path. For P(any survives), entries are improved
+        one at a time given the others until no entry changes (coordinate ascent),
+        which pushes entries away from picks that lose in the same seasons.
+        """
+        choice = {name: int(np.argmax(survival[name].mean(axis=1))) for name in names}
+        if self.objective == "expected_survivors" or len(names) == 1:
+            return choice
+
+        changed = True
+        while changed:
+            changed = False
+            for name in names:
+                others_alive = np.zeros(self.outcome_samples, dtype=bool)
+                for other in names:
+                    if other != name:
+                        others_alive |= survival[other][choice[other]]
+                # Seasons each path rescues that no other entry survives
+                gains = survival[name][:, ~others_alive].sum(axis=1)
+                best = int(np.argmax(gains))
+                if gains[best] > gains[choice[name]]:
+                    choice[name] = best
+                    changed = True
+        return choice
+
+
+if __name__ == "__main__":
+    PortfolioOptimizer().run()
@@ -1,5 +1,4 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import os
 from constants import (
@@ -101,6 +100,8 @@ class PredictionEvaluator:
         return summary, overall_accuracy, total_considered
     
     def plot_performance_by_threshold(self):
+        import matplotlib.pyplot as plt
+
         thresholds = np.arange(0.5, 0.91, 0.05)
 
         prediction_counts = []
@@ -130,23 +131,25 @@ class PredictionEvaluator:
         plt.show()
 
 
-evaluator = PredictionEvaluator(
-                "data/all_game_results_df.csv",
-                SCHEDULE_WITH_PROBABILITIES_PATH,
-                PROJECTED_WINS_CSV_PATH,
-                threshold=0.5
-            )
+def main(threshold=0.5, plot=False):
+    evaluator = PredictionEvaluator(
+        "data/all_game_results_df.csv",
+        SCHEDULE_WITH_PROBABILITIES_PATH,
+        PROJECTED_WINS_CSV_PATH,
+        threshold=threshold,
+    )
+
+    if plot:
+        evaluator.plot_performance_by_threshold()
+        return
 
-evaluator.plot_performance_by_threshold()
+    week_summary, overall_accuracy, _ = evaluator.evaluate_season(verbose=False)
+    print("Week-by-week record:")
+    for wk, data in week_summary.items():
+        print(f"Week {wk}: {data['correct']} correct out of {data['considered']}")
 
-# evaluator = PredictionEvaluator("data/all_game_results_df.csv", 
-#                                 SCHEDULE_WITH_PROBABILITIES_PATH, 
-#                                 PROJECTED_WINS_CSV_PATH, 
-#                                 threshold=0.5)
-# week_summary, overall_accuracy = evaluator.evaluate_season()
+    print("\nOverall accuracy:", overall_accuracy)
 
-# print("Week-by-week record:")
-# for wk, data in week_summary.items():
-#     print(f"Week {wk}: {data['correct']} correct out of {data['considered']}")
 
-# print("\nOverall accuracy:", overall_accuracy)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import numpy as np
+
+ROBUST_NUM_DRAWS = 5000
+# Standard deviations, in projected-win units (same units as the adjustments)
+ROBUST_TEAM_STRENGTH_NOISE = 1.0
+ROBUST_GAME_NOISE = 0.5
+ROBUST_QUANTILE = 0.1
+
+
+def build_pick_index(weeks, home_teams, away_teams):
+    """
+    Map each (week, team) pick to a column: 2 * game row for the home team,
+    2 * game row + 1 for the away team.
+    """
+    pick_index = {}
+    for i, (week, home, away) in enumerate(zip(weeks, home_teams, away_teams)):
+        pick_index[(week, home)] = 2 * i
+        pick_index[(week, away)] = 2 * i + 1
+    return pick_index
+
+
+def build_path_incidence(paths, pick_index, dtype=float):
+    """
+    paths: list of paths of (week, team, opponent, prob) tuples
+    Returns an (n_paths, n_picks) 0/1 matrix marking the picks each path makes.
+    """
+    incidence = np.zeros((len(paths), len(pick_index)), dtype=dtype)
+    for row, path in enumerate(paths):
+        for week, team, _, _ in path:
+            incidence[row, pick_index[(week, team)]] = 1
+    return incidence
+
+
+class RobustPathEvaluator:
+    def __init__(
+        self,
+        game_scores,
+        scale,
+        num_draws=ROBUST_NUM_DRAWS,
+        team_strength_noise=ROBUST_TEAM_STRENGTH_NOISE,
+        game_noise=ROBUST_GAME_NOISE,
+        seed=None,
+    ):
+        """
+        game_scores: DataFrame from NFLWinPredictor.get_game_scores()
+        scale: logistic scale used by the predictor
+
+        Draws num_draws perturbed probability tables. Each draw shifts every
+        team's strength by one amount for the whole season (our adjustments
+        being wrong) plus independent per-game noise, before the logistic.
+        """
+        rng = np.random.default_rng(seed)
+        home_teams = game_scores["home_team"].to_numpy()
+        away_teams = game_scores["away_team"].to_numpy()
+        weeks = game_scores["week"].to_numpy()
+        n_games = len(game_scores)
+
+        teams = np.unique(np.concatenate([home_teams, away_teams]))
+        home_idx = np.searchsorted(teams, home_teams)
+        away_idx = np.searchsorted(teams, away_teams)
+
+        team_noise = rng.normal(0, team_strength_noise, (num_draws, len(teams)))
+        home_scores = (
+            game_scores["home_score"].to_numpy()[None, :]
+            + team_noise[:, home_idx]
+            + rng.normal(0, game_noise, (num_draws, n_games))
+        )
+        away_scores = game_scores["away_score"].to_numpy()[None, :] + team_noise[:, away_idx]
+
+        home_probs = 1 / (1 + np.exp(-(home_scores - away_scores) / scale))
+        away_probs = 1 - home_probs
+        avoided = game_scores["avoided"].to_numpy(dtype=bool)
+        home_probs[:, avoided] = 0
+        away_probs[:, avoided] = 0
+
+        # One row per (week, team) pick, log win probability under every draw
+        self.pick_index = build_pick_index(weeks, home_teams, away_teams)
+        pick_probs = np.empty((2 * n_games, num_draws))
+        pick_probs[0::2] = home_probs.T
+        pick_probs[1::2] = away_probs.T
+        # Floor instead of log(0) so 0 * -inf never turns into nan in the product
+        self.log_probs = np.log(np.maximum(pick_probs, 1e-12))
+        self.num_draws = num_draws
+
+    def survival_by_draw(self, paths):
+        """
+        paths: iterable of paths of (week, team, opponent, prob) tuples
+        Returns an (n_paths, num_draws) matrix of survival probabilities,
+        computed as path-incidence @ log-probabilities.
+        """
+        incidence = build_path_incidence(list(paths), self.pick_index)
+        return np.exp(incidence @ self.log_probs)
+
+    def rank_paths(self, top_paths, ranking="expected", quantile=ROBUST_QUANTILE):
+        """
+        top_paths: list of (score, path) tuples from the search
+        ranking: "expected" for mean survival across draws, "quantile" for the
+        lower quantile of survival across draws
+        Returns a list of (robust_score, path) tuples, best first.
+        """
+        if not top_paths:
+            return []
+        paths = [path for _, path in top_paths]
+        survival = self.survival_by_draw(paths)
+        if ranking == "expected":
+            robust_scores = survival.mean(axis=1)
+        elif ranking == "quantile":
+            robust_scores = np.quantile(survival, quantile, axis=1)
+        else:
+            raise ValueError(f"Unknown robust ranking: {ranking}")
+
+        order = np.argsort(-robust_scores, kind="stable")
+        print(
+            f"Re-ranked {len(paths)} paths over {self.num_draws} perturbed probability tables "
+            f"by {ranking} survival (best {round(robust_scores[order[0]] * 100, 5)}%)"
+        )
+        return [(float(robust_scores[i]), paths[i]) for i in order]
@@ -0,0 +1,207 @@
+import csv
+import glob
+import hashlib
+import json
+import os
+import re
+import uuid
+from datetime import datetime
+from constants import (
+    SCHEDULE_CSV_PATH,
+    PROJECTED_WINS_CSV_PATH,
+    ADJUSTMENTS_MODULE_PATH,
+)
+
+# One JSON object per line, appended after every planning run
+RUN_ARCHIVE_PATH = "data/run_archive.jsonl"
+
+
+def score_type(strategy):
+    """
+    What a run's scores measure, from its strategy: "survival" for the point
+    estimate, or the robust ranking ("robust_expected", "robust_quantile").
+    """
+    _, _, robust = (strategy or "").partition("+")
+    return robust or "survival"
+
+
+def hash_file(path):
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def hash_frame(df):
+    import pandas as pd
+
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()[:16]
+
+
+def input_hashes(games_with_probs=None):
+    """Hashes of everything a run depends on, so runs on identical inputs can be spotted."""
+    hashes = {
+        "schedule": hash_file(SCHEDULE_CSV_PATH),
+        "projected_wins": hash_file(PROJECTED_WINS_CSV_PATH),
+        "adjustments": hash_file(ADJUSTMENTS_MODULE_PATH),
+    }
+    if games_with_probs is not None:
+        hashes["probabilities"] = hash_frame(games_with_probs)
+    return hashes
+
+
+class RunArchive:
+    def __init__(self, path=RUN_ARCHIVE_PATH):
+        self.path = path
+
+    def runs(self, pool=None):
+        """Every archived run, oldest first. pool: only runs of that pool."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+        return [run for run in runs if pool is None or run.get("pool") == pool]
+
+    def get(self, run_id):
+        for run in self.runs():
+            if run["run_id"] == run_id:
+                return run
+        raise KeyError(f"No run {run_id} in {self.path}")
+
+    def record(
+        self,
+        week,
+        top_paths,
+        artifact_path,
+        strategy,
+        simulations,
+        seed=None,
+        hashes=None,
+        timestamp=None,
+        run_id=None,
+        pool=None,
+    ):
+        """
+        Append one run to the manifest. top_paths are the run's (score, path)
+        tuples, best first; the best path is stored so queries never need the
+        run's CSVs. pool: the pool the run was for (first_chance, second_chance
+        or a pool_planner.py pool). Generated run IDs end in a random suffix,
+        since runs can save in the same second. Returns the manifest entry.
+        """
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        best_score, best_path = top_paths[0] if top_paths else (0.0, ())
+        prefix = "-".join([re.sub(r"[^0-9]", "", timestamp)] + ([pool] if pool else []))
+        entry = {
+            "run_id": run_id or f"{prefix}-{os.path.basename(artifact_path)}-{uuid.uuid4().hex[:6]}",
+            "pool": pool,
+            "week": int(week),
+            "timestamp": timestamp,
+            "input_hashes": hashes or {},
+            "strategy": strategy,
+            "score_type": score_type(strategy),
+            "simulations": simulations,
+            "seed": seed,
+            "best_score": float(best_score),
+            "best_path": [
+                [int(w), str(team), str(opponent), float(prob)] for w, team, opponent, prob in best_path
+            ],
+            "paths_kept": len(top_paths),
+            "artifact_path": artifact_path,
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # A single append per run, so concurrent runs never interleave lines
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def best_per_week(self, pool=None, scores="survival"):
+        """
+        Returns {week: run} with the highest best_score for each week, among
+        runs whose scores measure the same thing (see score_type).
+        """
+        best = {}
+        for run in self.runs(pool):
+            if run.get("score_type", score_type(run["strategy"])) != scores:
+                continue
+            if run["week"] not in best or run["best_score"] > best[run["week"]]["best_score"]:
+                best[run["week"]] = run
+        return dict(sorted(best.items()))
+
+    def runs_with_top_pick(self, team, week=None, pool=None):
+        """
+        Runs whose best path picks `team` in `week`, or in the run's own week (the
+        pick to make now) when no week is given.
+        """
+        matches = []
+        for run in self.runs(pool):
+            target_week = run["week"] if week is None else week
+            if any(w == target_week and pick == team for w, pick, _, _ in run["best_path"]):
+                matches.append(run)
+        return matches
+
+    def diff(self, run_id_a, run_id_b):
+        """
+        Compare two runs: change in best score, inputs that changed and the weeks
+        where the best paths pick differently.
+        """
+        run_a, run_b = self.get(run_id_a), self.get(run_id_b)
+        picks_a = {w: (team, prob) for w, team, _, prob in run_a["best_path"]}
+        picks_b = {w: (team, prob) for w, team, _, prob in run_b["best_path"]}
+        hashes_a, hashes_b = run_a["input_hashes"], run_b["input_hashes"]
+        return {
+            "runs": [run_id_a, run_id_b],
+            "best_score_change": run_b["best_score"] - run_a["best_score"],
+            "changed_inputs": sorted(
+                key for key in set(hashes_a) | set(hashes_b) if hashes_a.get(key) != hashes_b.get(key)
+            ),
+            "changed_picks": {
+                week: [picks_a.get(week), picks_b.get(week)]
+                for week in sorted(set(picks_a) | set(picks_b))
+                if picks_a.get(week, (None,))[0] != picks_b.get(week, (None,))[0]
+            },
+        }
+
+    def backfill(self, data_folder="data"):
+        """
+        Add runs saved before the archive existed, read once from their picks.csv
+        and weekly_options.txt. Folders already in the manifest are skipped.
+        Returns the number of runs added.
+        """
+        known = {run["artifact_path"] for run in self.runs()}
+        added = 0
+        for picks_path in sorted(glob.glob(os.path.join(data_folder, "*_chance", "week*", "*", "picks.csv"))):
+            folder = os.path.dirname(picks_path).replace(os.sep, "/")
+            if folder in known:
+                continue
+            week = int(re.search(r"week(\d+)", folder).group(1))
+            with open(picks_path, newline="") as f:
+                rows = [
+                    (int(row["week"]), row["pick"], row["opponent"], float(row["win_prob"]))
+                    for row in csv.DictReader(f)
+                ]
+            best_path = [row for row in rows if row[0] >= week]
+            score = 1.0
+            for _, _, _, prob in best_path:
+                score *= prob
+
+            timestamp = None
+            options_path = os.path.join(os.path.dirname(picks_path), "weekly_options.txt")
+            if os.path.exists(options_path):
+                with open(options_path) as f:
+                    match = re.search(r"generated at ([\d\- :]+)\)", f.readline())
+                timestamp = match.group(1) if match else None
+            self.record(
+                week,
+                [(score, best_path)],
+                folder,
+                strategy="unknown",
+                simulations=None,
+                timestamp=timestamp or datetime.fromtimestamp(os.path.getmtime(picks_path)).strftime("%Y-%m-%d %H:%M:%S"),
+                run_id=folder.split("/", 1)[-1].replace("/", "-"),
+                pool=folder.split("/")[-3],
+            )
+            added += 1
+        return added
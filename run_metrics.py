@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class RunMetrics:
+    def __init__(self):
+        self.stage_seconds = {}
+        self.counters = Counter()
+        self.values = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] = (
+                self.stage_seconds.get(name, 0) + time.perf_counter() - start
+            )
+
+    def increment(self, name, amount=1):
+        self.counters[name] += amount
+
+    def set(self, name, value):
+        self.values[name] = value
+
+    def peak_rss_mb(self):
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 2)
+
+    def to_dict(self):
+        return {
+            "stage_seconds": {k: round(v, 4) for k, v in self.stage_seconds.items()},
+            "counters": dict(self.counters),
+            **self.values,
+            "peak_rss_mb": self.peak_rss_mb(),
+        }
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=float)
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.005):
+        """
+        Samples the calling thread's stack every `interval` seconds from a
+        background thread. Output is in the collapsed-stack format read by
+        flamegraph.pl and speedscope.
+        """
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._target_id = None
+
+    def __enter__(self):
+        self._target_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
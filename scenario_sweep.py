@@ -0,0 +1,88 @@
+import os
+import pandas as pd
+from win_predictor import NFLWinPredictor
+from nfl_survivor_assistant_monte_carlo import (
+    NFLSurvivorPickerMonteCarlo,
+    SHOULD_SCRAPE_CURRENT_WINS,
+    get_current_prediction_week,
+)
+from worker_pool import map_on_workers, worker_inputs
+
+SCENARIO_SIMULATIONS = 1_000_000
+
+# Scenario name -> overrides for compile_adjustments (see ADJUSTMENT_TABLES)
+SCENARIOS = {
+    "baseline": {},
+    "PIT QB back in week 14": {"INJURY_ADJUSTMENTS": {"PIT": [[11, 13, -2.0]]}},
+    "no week 18 avoids": {"TEAMS_TO_AVOID_IN_WEEK_18": []},
+}
+
+def _run_scenario(name):
+    picker = NFLSurvivorPickerMonteCarlo(
+        worker_inputs["simulations"], games_with_probs=worker_inputs["tables"][name]
+    )
+    top_paths = picker.search(
+        worker_inputs["weeks"], worker_inputs["candidates"][name], worker_inputs["used_teams"]
+    )
+    return name, top_paths
+
+
+class ScenarioSweep:
+    def __init__(self, scenarios=SCENARIOS, simulations=SCENARIO_SIMULATIONS, max_workers=None):
+        """
+        scenarios: dict of scenario name -> adjustment overrides
+        simulations: Monte Carlo simulations per scenario
+        max_workers: worker processes for the searches (defaults to CPU count)
+        """
+        self.scenarios = scenarios
+        self.simulations = simulations
+        self.max_workers = max_workers
+
+    def run(self):
+        """
+        Compute every scenario's probability table in one batched predictor pass,
+        then search each scenario on a worker pool. Returns a comparison DataFrame
+        with the best path and its survival probability per scenario.
+        """
+        names = list(self.scenarios)
+        predictor = NFLWinPredictor(get_current_prediction_week(), SHOULD_SCRAPE_CURRENT_WINS)
+        tables = dict(
+            zip(names, predictor.batch_win_probabilities([self.scenarios[n] for n in names]))
+        )
+
+        candidates = {}
+        for name in names:
+            print(f"Scenario '{name}':")
+            picker = NFLSurvivorPickerMonteCarlo(self.simulations, games_with_probs=tables[name])
+            weeks = picker.get_search_weeks()
+            used_teams = picker.get_used_teams()
+            candidates[name] = picker.build_candidates(weeks, used_teams)
+
+        shared = {
+            "simulations": self.simulations,
+            "tables": tables,
+            "weeks": weeks,
+            "used_teams": used_teams,
+            "candidates": candidates,
+        }
+        results = dict(map_on_workers(_run_scenario, names, shared, self.max_workers))
+
+        rows = []
+        for name in names:
+            top_paths = results[name]
+            row = {"scenario": name, "survival": top_paths[0][0] if top_paths else 0.0}
+            if top_paths:
+                for week, team, opponent, _ in top_paths[0][1]:
+                    row[f"week {week}"] = f"{team} over {opponent}"
+            rows.append(row)
+        comparison = pd.DataFrame(rows).sort_values("survival", ascending=False)
+
+        week_folder = picker.get_week_folder()
+        os.makedirs(week_folder, exist_ok=True)
+        comparison.to_csv(f"{week_folder}/scenario_sweep.csv", index=False)
+        print(comparison.to_string(index=False))
+        return comparison
+
+
+if __name__ == "__main__":
+    ScenarioSweep().run()
@@ -0,0 +1,152 @@
+import json
+import os
+import pandas as pd
+from constants import SCHEDULE_CSV_PATH
+from run_archive import hash_file
+
+# Hashes of schedule files that passed validation, so they are only checked once
+SCHEDULE_VALIDATION_CACHE_PATH = "data/schedule_validation.json"
+
+
+class ScheduleValidationError(ValueError):
+    def __init__(self, path, errors):
+        self.path = path
+        self.errors = errors
+        super().__init__(
+            f"{path} failed validation:\n" + "\n".join(f"  {error['message']}" for error in errors)
+        )
+
+
+def team_appearances(schedule):
+    """One (week, team) row per team per game."""
+    return pd.concat(
+        [
+            schedule[["week", "home_team"]].rename(columns={"home_team": "team"}),
+            schedule[["week", "away_team"]].rename(columns={"away_team": "team"}),
+        ],
+        ignore_index=True,
+    )
+
+
+def validate_schedule(schedule, games_per_team=None, max_games_per_week=None):
+    """
+    Check a schedule (week, home_team, away_team) in a few vectorized passes.
+    games_per_team defaults to one game every week but the bye (17 in an 18-week
+    season), max_games_per_week to half the teams (16).
+    Returns a list of error dicts, each with a "check" name, a "message" and the
+    offending rows, teams or weeks. Empty means valid.
+    """
+    missing = {"week", "home_team", "away_team"} - set(schedule.columns)
+    if missing:
+        return [{"check": "columns", "message": f"Missing columns: {sorted(missing)}", "columns": sorted(missing)}]
+
+    errors = []
+    n_weeks = schedule["week"].nunique()
+    appearances = team_appearances(schedule)
+    games_per_team = n_weeks - 1 if games_per_team is None else games_per_team
+    max_games_per_week = (
+        appearances["team"].nunique() // 2 if max_games_per_week is None else max_games_per_week
+    )
+
+    duplicates = schedule[schedule.duplicated(["week", "home_team", "away_team"], keep="first")]
+    for row in duplicates.itertuples(index=False):
+        errors.append(
+            {
+                "check": "duplicate_game",
+                "message": f"Week {row.week}: {row.away_team} @ {row.home_team} is listed more than once",
+                "week": int(row.week),
+                "teams": [row.home_team, row.away_team],
+            }
+        )
+
+    self_matches = schedule[schedule["home_team"] == schedule["away_team"]]
+    for row in self_matches.itertuples(index=False):
+        errors.append(
+            {
+                "check": "self_match",
+                "message": f"Week {row.week}: {row.home_team} plays itself",
+                "week": int(row.week),
+                "teams": [row.home_team],
+            }
+        )
+
+    # Duplicated games are already reported above
+    team_week_counts = appearances.drop_duplicates().groupby(["team", "week"]).size()
+    for (team, week), count in team_week_counts[team_week_counts > 1].items():
+        errors.append(
+            {
+                "check": "team_plays_twice",
+                "message": f"Week {week}: {team} plays {count} games",
+                "week": int(week),
+                "teams": [team],
+            }
+        )
+
+    games = appearances.groupby("team").size()
+    for team, count in games[games != games_per_team].items():
+        errors.append(
+            {
+                "check": "games_per_team",
+                "message": f"{team} plays {count} games, expected {games_per_team}",
+                "teams": [team],
+                "games": int(count),
+            }
+        )
+
+    played = pd.crosstab(appearances["team"], appearances["week"]) > 0
+    bye_counts = (~played).sum(axis=1)
+    for team, count in bye_counts[bye_counts != 1].items():
+        bye_weeks = [int(week) for week in played.columns[~played.loc[team].to_numpy()]]
+        errors.append(
+            {
+                "check": "bye_weeks",
+                "message": f"{team} has {count} bye weeks {bye_weeks}, expected exactly one",
+                "teams": [team],
+                "weeks": bye_weeks,
+            }
+        )
+
+    week_sizes = schedule.groupby("week").size()
+    for week, count in week_sizes[week_sizes > max_games_per_week].items():
+        errors.append(
+            {
+                "check": "games_per_week",
+                "message": f"Week {week} has {count} games, at most {max_games_per_week} possible",
+                "week": int(week),
+                "games": int(count),
+            }
+        )
+    return errors
+
+
+def bye_week_map(schedule):
+    """{team: bye week} for a schedule where every team has exactly one bye."""
+    appearances = team_appearances(schedule)
+    played = pd.crosstab(appearances["team"], appearances["week"]) > 0
+    # idxmin finds the first week each team didn't play
+    return {team: int(week) for team, week in played.idxmin(axis=1).items()}
+
+
+def load_validated_schedule(path=SCHEDULE_CSV_PATH, cache_path=SCHEDULE_VALIDATION_CACHE_PATH):
+    """
+    Read a schedule CSV, validating it unless a file with the same content
+    already passed. Raises ScheduleValidationError listing every problem found.
+    """
+    schedule = pd.read_csv(path)
+    digest = hash_file(path)
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cache = json.load(f)
+    if cache.get(path) == digest:
+        return schedule
+
+    errors = validate_schedule(schedule)
+    if errors:
+        raise ScheduleValidationError(path, errors)
+
+    cache[path] = digest
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump(cache, f, indent=2)
+    return schedule
@@ -0,0 +1,252 @@
+"""
+Elo-style team strength updated from game results.
+
+Ratings start from the preseason projected wins and move after every game by
+how surprising the result was, scaled by the margin of victory. They are
+converted back to the wins scale the predictor uses, so they can stand in for
+the current/projected wins blend (STRENGTH_MODEL = "elo" in win_predictor.py).
+
+The state is saved to data/team_ratings.json with the games already counted,
+so each run only processes newly scraped results.
+"""
+import hashlib
+import json
+import math
+import os
+import numpy as np
+import pandas as pd
+from constants import GAME_RESULTS_CSV_PATH, PROJECTED_WINS_CSV_PATH
+
+TEAM_RATINGS_STATE_PATH = "data/team_ratings.json"
+ELO_BASE_RATING = 1500
+# Update size in wins rather than Elo points, so it doesn't change with SCALE:
+# an evenly matched game won by 7 moves each team by about
+# ELO_K_WINS * ln(8) / 2 = 0.31 wins. 0.3 had the lowest backtest_log_loss on
+# this season's results (0.618, vs 0.628 for the preseason prior alone);
+# anything from 0.25 to 0.4 is within 0.001, while 0.6 is already worse
+# (0.623). Larger values mostly widen the spread of ratings rather than track
+# records: close losses barely count, so a team that wins big and loses
+# close stays near its prior.
+ELO_K_WINS = 0.3
+# Projected wins of an average team, which maps to ELO_BASE_RATING
+AVERAGE_WINS = 8.5
+
+
+def elo_points_per_win(scale):
+    """
+    Elo points equal to one win on the predictor's scale, chosen so that both
+    give the same win probability: 1 / (1 + exp(-wins_diff / scale)) equals
+    1 / (1 + 10 ** (-elo_diff / 400)).
+    """
+    return 400 / (scale * math.log(10))
+
+
+def load_game_results(path=GAME_RESULTS_CSV_PATH, names_path=PROJECTED_WINS_CSV_PATH, schedule=None):
+    """
+    Game results as (week, winner, loser, winner_score, loser_score,
+    winner_home) with team abbreviations. winner_home is 1 if the winner was
+    the home team in `schedule`, -1 if the loser was and 0 if the game isn't
+    in the schedule. Games the scraper couldn't read (no teams, scores of -1)
+    are left out.
+    """
+    names = pd.read_csv(names_path)
+    abbreviations = dict(zip(names["team"], names["abbreviation"]))
+    games = pd.read_csv(path)
+    played = (
+        games[["winner", "loser"]].notna().all(axis=1)
+        & (games["winner_score"] >= 0)
+        & (games["loser_score"] >= 0)
+    )
+    games = games.loc[played].reset_index(drop=True)
+    for column in ("winner", "loser"):
+        mapped = games[column].map(abbreviations)
+        if mapped.isna().any():
+            raise ValueError(f"Unknown teams in {path}: {sorted(set(games.loc[mapped.isna(), column]))}")
+        games[column] = mapped
+
+    games["winner_home"] = 0
+    if schedule is not None:
+        home_games = schedule[["week", "home_team", "away_team"]]
+        winner_home = games.merge(
+            home_games, left_on=["week", "winner", "loser"], right_on=["week", "home_team", "away_team"], how="left"
+        )["home_team"].notna()
+        loser_home = games.merge(
+            home_games, left_on=["week", "loser", "winner"], right_on=["week", "home_team", "away_team"], how="left"
+        )["home_team"].notna()
+        games["winner_home"] = winner_home.astype(int).to_numpy() - loser_home.astype(int).to_numpy()
+    return games
+
+
+class TeamRatings:
+    def __init__(self, prior_wins, scale, home_field_advantage, k_wins=ELO_K_WINS):
+        """
+        prior_wins: {team: preseason projected wins}
+        scale, home_field_advantage: the predictor's logistic scale and home
+        bump, both in wins
+        k_wins: update size in wins (see ELO_K_WINS)
+        """
+        self.teams = sorted(prior_wins)
+        self.team_idx = {team: i for i, team in enumerate(self.teams)}
+        self.prior_wins = {team: float(wins) for team, wins in prior_wins.items()}
+        self.scale = scale
+        self.home_field_advantage = home_field_advantage
+        self.k_wins = k_wins
+        self.points_per_win = elo_points_per_win(scale)
+        # The same update size in Elo points
+        self.k = k_wins * self.points_per_win
+        self.ratings = self.prior_ratings()
+        # "week:winner:loser" keys of the games already counted
+        self.processed = set()
+        self.last_week = 0
+
+    def prior_ratings(self):
+        wins = np.array([self.prior_wins[team] for team in self.teams])
+        return ELO_BASE_RATING + (wins - AVERAGE_WINS) * self.points_per_win
+
+    def fingerprint(self):
+        """Hash of everything the ratings depend on besides the games."""
+        settings = [sorted(self.prior_wins.items()), self.scale, self.home_field_advantage, self.k_wins, ELO_BASE_RATING]
+        return hashlib.sha256(json.dumps(settings).encode()).hexdigest()[:16]
+
+    def reset(self):
+        self.ratings = self.prior_ratings()
+        self.processed = set()
+        self.last_week = 0
+
+    @staticmethod
+    def game_keys(games):
+        return (
+            games["week"].astype(str) + ":" + games["winner"] + ":" + games["loser"]
+        ).tolist()
+
+    def update(self, games):
+        """
+        Count the games not seen before. If any of them is from a week before
+        the latest one already counted, the season is replayed from the prior
+        so the updates stay in week order. Returns the number of games applied.
+        """
+        keys = self.game_keys(games)
+        new = np.array([key not in self.processed for key in keys], dtype=bool)
+        if not new.any():
+            return 0
+        if games.loc[new, "week"].min() < self.last_week:
+            self.reset()
+            new[:] = True
+        self.apply(games.loc[new])
+        self.processed.update(key for key, is_new in zip(keys, new) if is_new)
+        return int(new.sum())
+
+    def apply(self, games):
+        """Update the ratings week by week, all of a week's games at once."""
+        for week, week_games in games.groupby("week", sort=True):
+            self.ratings += self.week_deltas(week_games)
+            self.last_week = max(self.last_week, int(week))
+
+    def week_deltas(self, games):
+        winners = games["winner"].map(self.team_idx).to_numpy()
+        losers = games["loser"].map(self.team_idx).to_numpy()
+        margin = (games["winner_score"] - games["loser_score"]).to_numpy()
+        home_points = self.home_field_advantage * self.points_per_win
+
+        # Rating edge of the winner, including home field
+        edge = self.ratings[winners] - self.ratings[losers] + home_points * games["winner_home"].to_numpy()
+        expected = 1 / (1 + 10 ** (-edge / 400))
+        result = np.where(margin == 0, 0.5, 1.0)
+        # Bigger wins count more, less so when the favorite won big
+        multiplier = np.log(np.maximum(margin, 1) + 1) * 2.2 / (edge * 0.001 + 2.2)
+        change = self.k * multiplier * (result - expected)
+
+        deltas = np.zeros(len(self.teams))
+        np.add.at(deltas, winners, change)
+        np.add.at(deltas, losers, -change)
+        return deltas
+
+    def history(self, games):
+        """
+        Replay the season from the prior without touching this object's state,
+        for backtests. Returns (weeks, ratings): ratings has one more row than
+        weeks, the prior followed by every team's rating after each week.
+        """
+        replay = TeamRatings(self.prior_wins, self.scale, self.home_field_advantage, self.k_wins)
+        weeks, ratings = [], [replay.ratings.copy()]
+        for week, week_games in games.groupby("week", sort=True):
+            replay.ratings += replay.week_deltas(week_games)
+            weeks.append(int(week))
+            ratings.append(replay.ratings.copy())
+        return weeks, np.stack(ratings)
+
+    def backtest_log_loss(self, games, first_week=2):
+        """
+        Mean log loss of predicting every decided game from `first_week` on
+        with the ratings from the weeks before it, home field included. Used to
+        pick ELO_K_WINS.
+        """
+        weeks, ratings = self.history(games)
+        losses = []
+        for week, before in zip(weeks, ratings[:-1]):
+            week_games = games.loc[(games["week"] == week) & (games["winner_score"] > games["loser_score"])]
+            if week < first_week or week_games.empty:
+                continue
+            edge = (
+                before[week_games["winner"].map(self.team_idx).to_numpy()]
+                - before[week_games["loser"].map(self.team_idx).to_numpy()]
+                + self.home_field_advantage * self.points_per_win * week_games["winner_home"].to_numpy()
+            )
+            losses.append(np.log1p(10 ** (-edge / 400)))
+        return float(np.concatenate(losses).mean())
+
+    def to_wins(self, ratings):
+        return AVERAGE_WINS + (ratings - ELO_BASE_RATING) / self.points_per_win
+
+    def team_wins(self):
+        """Current ratings on the predictor's wins scale, {team: wins}."""
+        return dict(zip(self.teams, self.to_wins(self.ratings).tolist()))
+
+    def to_dict(self):
+        return {
+            "fingerprint": self.fingerprint(),
+            "last_week": self.last_week,
+            "ratings": dict(zip(self.teams, self.ratings.tolist())),
+            "processed": sorted(self.processed),
+        }
+
+    def save(self, path=TEAM_RATINGS_STATE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, prior_wins, scale, home_field_advantage, k_wins=ELO_K_WINS, path=TEAM_RATINGS_STATE_PATH):
+        """Saved ratings if they were built with the same settings, otherwise fresh ones from the prior."""
+        ratings = cls(prior_wins, scale, home_field_advantage, k_wins)
+        if not os.path.exists(path):
+            return ratings
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("fingerprint") != ratings.fingerprint():
+            return ratings
+        ratings.ratings = np.array([state["ratings"][team] for team in ratings.teams])
+        ratings.processed = set(state["processed"])
+        ratings.last_week = state["last_week"]
+        return ratings
+
+
+def current_team_wins(prior_wins, scale, home_field_advantage, before_week, schedule=None, path=TEAM_RATINGS_STATE_PATH):
+    """
+    Ratings from every game before `before_week`, on the wins scale. Loads the
+    saved state, applies only the new results and saves it again. Starting
+    over when the state already counts `before_week` or later keeps earlier
+    weeks' predictions reproducible.
+    """
+    ratings = TeamRatings.load(prior_wins, scale, home_field_advantage, path=path)
+    if ratings.last_week >= before_week:
+        ratings.reset()
+    if os.path.exists(GAME_RESULTS_CSV_PATH):
+        games = load_game_results(schedule=schedule)
+        applied = ratings.update(games.loc[games["week"] < before_week])
+        if applied:
+            print(f"Updated team ratings with {applied} new game results")
+    ratings.save(path)
+    return ratings.team_wins()
@@ -0,0 +1,148 @@
+"""
+Watch mode: python cli.py watch
+
+Polls the adjustments module and the input CSVs. After a burst of saves settles,
+it reloads what changed, rescores only the affected teams and weeks in the warm
+planning state, re-searches starting from the previous best paths and prints
+the new recommendation.
+"""
+import importlib
+import os
+import sys
+import time
+import win_predictor_adjustments_helper as adjustments
+from constants import (
+    SCHEDULE_CSV_PATH,
+    PROJECTED_WINS_CSV_PATH,
+    GAME_RESULTS_CSV_PATH,
+    ADJUSTMENTS_MODULE_PATH,
+)
+from planning_service import PlanningState
+from win_predictor import STRENGTH_MODEL
+
+WATCHED_PATHS = [ADJUSTMENTS_MODULE_PATH, PROJECTED_WINS_CSV_PATH, SCHEDULE_CSV_PATH]
+if STRENGTH_MODEL == "elo":
+    # Elo ratings are updated from the game results
+    WATCHED_PATHS.append(GAME_RESULTS_CSV_PATH)
+WATCH_POLL_INTERVAL = 0.25
+# Seconds without further saves before a burst of edits is handled
+WATCH_DEBOUNCE = 0.75
+# Helper values used by every game, so changing them rescores everything
+GLOBAL_ADJUSTMENTS = ["BYE_WEEK_ADJUSTMENT", "DIVISIONAL_UNDERDOG_MATCHUP_ADJUSTMENT"]
+
+# Values from the last successful load, which other modules may have imported
+loaded_adjustments = dict(vars(adjustments))
+
+
+class InputWatcher:
+    def __init__(self, paths=WATCHED_PATHS, interval=WATCH_POLL_INTERVAL, debounce=WATCH_DEBOUNCE):
+        self.paths = paths
+        self.interval = interval
+        self.debounce = debounce
+        self.seen = self.mtimes()
+
+    def mtimes(self):
+        return {
+            path: os.stat(path).st_mtime_ns if os.path.exists(path) else None
+            for path in self.paths
+        }
+
+    def wait_for_change(self):
+        """Block until files changed and then stayed untouched for `debounce` seconds. Returns the changed paths."""
+        changed = set()
+        last_change = None
+        while True:
+            time.sleep(self.interval)
+            current = self.mtimes()
+            modified = {path for path in self.paths if current[path] != self.seen[path]}
+            self.seen = current
+            if modified:
+                changed |= modified
+                last_change = time.monotonic()
+            elif changed and time.monotonic() - last_change >= self.debounce:
+                return changed
+
+
+def reload_adjustments():
+    """
+    Reload the adjustments module and point every project module that imported
+    names from it at the new values. Returns True if a value every game
+    depends on changed.
+    """
+    # A reload that fails mid-way leaves the module half updated, so compare
+    # against the last good load rather than the module's current contents
+    old = dict(loaded_adjustments)
+    importlib.reload(adjustments)
+    loaded_adjustments.clear()
+    loaded_adjustments.update(vars(adjustments))
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in list(sys.modules.values()):
+        if module is adjustments or not (getattr(module, "__file__", None) or "").startswith(project_dir):
+            continue
+        for name, value in list(vars(module).items()):
+            if name in old and value is old[name] and hasattr(adjustments, name):
+                setattr(module, name, getattr(adjustments, name))
+    return any(old.get(name) != getattr(adjustments, name) for name in GLOBAL_ADJUSTMENTS)
+
+
+def apply_changes(state, changed_paths):
+    """
+    Bring the planning state up to date with the changed files. Returns the
+    (possibly new) state and the weeks that were recomputed.
+    """
+    rescore_all = False
+    if ADJUSTMENTS_MODULE_PATH in changed_paths:
+        rescore_all = reload_adjustments()
+
+    chosen = adjustments.ALREADY_CHOSEN_TEAMS
+    if SCHEDULE_CSV_PATH in changed_paths or chosen != state.already_chosen_teams:
+        # The open weeks or used teams changed, so nothing in the state carries over
+        new_state = PlanningState(chosen)
+        new_state.set_overrides(state.overrides)
+        for week, team in state.locks.items():
+            try:
+                new_state.lock(week, team)
+            except ValueError as e:
+                print(f"Dropped lock {team} in week {week}: {e}")
+        new_state.last_paths = state.last_paths
+        return new_state, new_state.weeks
+
+    return state, state.refresh_inputs(rescore_all)
+
+
+def print_recommendation(state, k):
+    top_paths = state.top_paths(k)
+    if not top_paths:
+        print("No path survives with the current candidates.")
+        return
+    for rank, (score, path) in enumerate(top_paths, 1):
+        picks = ", ".join(f"{week}: {team} over {opponent}" for week, team, opponent, _ in path)
+        print(f"{rank}. {round(score * 100, 3)}%  {picks}")
+
+
+def watch(k=5, interval=WATCH_POLL_INTERVAL, debounce=WATCH_DEBOUNCE):
+    state = PlanningState(adjustments.ALREADY_CHOSEN_TEAMS)
+    print(f"Week {state.week}, top {k} paths:")
+    print_recommendation(state, k)
+
+    watcher = InputWatcher(interval=interval, debounce=debounce)
+    print(f"Watching {', '.join(WATCHED_PATHS)} (Ctrl-C to stop)")
+    try:
+        while True:
+            changed = watcher.wait_for_change()
+            start = time.perf_counter()
+            try:
+                state, weeks = apply_changes(state, changed)
+                print(f"\n{', '.join(sorted(changed))} changed, recomputed weeks {weeks}")
+                print_recommendation(state, k)
+            except Exception as e:
+                # Files are often saved mid-edit, keep the last good state
+                print(f"\nCould not apply changes to {', '.join(sorted(changed))}: {e!r}")
+                continue
+            print(f"Updated in {round(time.perf_counter() - start, 3)}s")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    watch()
@@ -1,8 +1,9 @@
 import pandas as pd
 import numpy as np
 import math
-from team_win_scraper import TeamWinScraper
 from win_predictor_adjustments_helper import (
+    BYE_WEEK_ADJUSTMENT,
+    DIVISIONAL_UNDERDOG_MATCHUP_ADJUSTMENT,
     HOME_TEAM_ADJUSTMENTS,
     TEAMS_TO_AVOID_IN_WEEK_18,
     apply_divisional_underdog_adjustment,
@@ -10,6 +11,7 @@ from win_predictor_adjustments_helper import (
     apply_bye_week_adjustment,
     apply_upset_riskiness_adjustment,
     apply_momentum_adjustment,
+    compile_adjustments,
 )
 from constants import (
     SCHEDULE_CSV_PATH,
@@ -17,10 +19,16 @@ from constants import (
     FULL_CALC_CSV_PATH,
     PROJECTED_WINS_CSV_PATH,
 )
+from schedule_validator import bye_week_map, load_validated_schedule
+from team_ratings import current_team_wins
 
 SCALE = 3.5
 HOME_FIELD_ADVANTAGE = 0.5
 PREDICTION_DECAY_HALFLIFE = 25
+# Team strength before adjustments: "blend" weighs current wins against
+# projected wins by games played, "elo" uses ratings updated from game
+# results (team_ratings.py)
+STRENGTH_MODEL = "blend"
 
 
 class NFLWinPredictor:
@@ -28,24 +36,34 @@ class NFLWinPredictor:
         self,
         current_prediction_week,
         should_scrape_current_wins,
+        strength_model=STRENGTH_MODEL,
     ):
         if should_scrape_current_wins:
+            # Imported here so requests/bs4 are only loaded when actually scraping
+            from team_win_scraper import TeamWinScraper
+
             TeamWinScraper.update_wins_column_in_csv(PROJECTED_WINS_CSV_PATH)
 
         self.current_prediction_week = current_prediction_week
         self.scale = SCALE
         self.home_field_advantage = HOME_FIELD_ADVANTAGE
         self.prediction_decay_halflife = PREDICTION_DECAY_HALFLIFE
+        self.strength_model = strength_model
         self.data = pd.read_csv(PROJECTED_WINS_CSV_PATH)
-        self.schedule = pd.read_csv(SCHEDULE_CSV_PATH)
+        self.schedule = load_validated_schedule(SCHEDULE_CSV_PATH)
         self.projected_wins = dict(
             zip(self.data["abbreviation"], self.data["projected_wins"])
         )
         self.current_wins = dict(
             zip(self.data["abbreviation"], self.data["current_wins"])
         )
-        self.team_bye_week = self.create_bye_week_map(SCHEDULE_CSV_PATH)
-        self.team_wins = self.calculate_team_wins_dict(current_prediction_week)
+        self.team_bye_week = self.create_bye_week_map(self.schedule)
+        if strength_model == "elo":
+            self.team_wins = self.calculate_rating_wins_dict(current_prediction_week)
+        elif strength_model == "blend":
+            self.team_wins = self.calculate_team_wins_dict(current_prediction_week)
+        else:
+            raise ValueError(f"Unknown strength model: {strength_model}")
 
     def calculate_team_wins_dict(self, current_prediction_week):
         team_wins = {}
@@ -63,35 +81,25 @@ class NFLWinPredictor:
             )
         return team_wins
 
-    def create_bye_week_map(self, schedule_csv):
-        schedule = pd.read_csv(schedule_csv)
-        teams = set(schedule["home_team"]).union(set(schedule["away_team"]))
-        weeks = set(schedule["week"])
-        bye_week_map = {}
-        for team in teams:
-            played_weeks = set(
-                schedule.loc[
-                    (schedule["home_team"] == team) | (schedule["away_team"] == team),
-                    "week",
-                ]
-            )
-            bye_weeks = weeks - played_weeks
-
-            if len(bye_weeks) > 1 or bye_weeks == set():
-                print(f"Warning: Team {team} has multiple bye weeks: {bye_weeks}")
-                raise ValueError(
-                    "Each team should have only one bye week in a standard NFL season."
-                )
+    def calculate_rating_wins_dict(self, current_prediction_week):
+        return current_team_wins(
+            self.projected_wins,
+            self.scale,
+            self.home_field_advantage,
+            current_prediction_week,
+            self.schedule,
+        )
 
-            bye_week_map[team] = list(bye_weeks)[0] if bye_weeks else None
-        return bye_week_map
+    def create_bye_week_map(self, schedule):
+        # The schedule was validated on load, so every team has exactly one bye
+        return bye_week_map(schedule)
 
-    def calculate_win_probability(self, home_team, away_team, week_number):
+    def calculate_game_scores(self, home_team, away_team, week_number):
         if home_team not in self.team_wins or away_team not in self.team_wins:
             raise ValueError("Both teams must exist in the dataset")
 
-        home_score = home_wins_preadjustment = self.team_wins[home_team]
-        away_score = away_wins_preadjustment = self.team_wins[away_team]
+        home_score = self.team_wins[home_team]
+        away_score = self.team_wins[away_team]
 
         # Home field advantage adjustment
         home_score += self.home_field_advantage + HOME_TEAM_ADJUSTMENTS.get(
@@ -122,17 +130,28 @@ class NFLWinPredictor:
         home_score, away_score = apply_divisional_underdog_adjustment(
             home_team, away_team, home_score, away_score
         )
+        return home_score, away_score
+
+    def is_avoided_game(self, home_team, away_team, week_number):
+        # Avoid good teams in week 18 - they might not have anything to play for
+        return week_number == 18 and (
+            home_team in TEAMS_TO_AVOID_IN_WEEK_18
+            or away_team in TEAMS_TO_AVOID_IN_WEEK_18
+        )
+
+    def calculate_win_probability(self, home_team, away_team, week_number):
+        home_score, away_score = self.calculate_game_scores(
+            home_team, away_team, week_number
+        )
+        home_wins_preadjustment = self.team_wins[home_team]
+        away_wins_preadjustment = self.team_wins[away_team]
 
         # Scaled logistic function
         diff = (home_score - away_score) / self.scale
         home_prob = 1 / (1 + np.exp(-diff))
         away_prob = 1 - home_prob
 
-        # Avoid good teams in week 18 - they might not have anything to play for
-        if week_number == 18 and (
-            home_team in TEAMS_TO_AVOID_IN_WEEK_18
-            or away_team in TEAMS_TO_AVOID_IN_WEEK_18
-        ):
+        if self.is_avoided_game(home_team, away_team, week_number):
             home_prob, away_prob = 0, 0
 
         adj_home_prob = self.time_dilate_probability(
@@ -172,12 +191,146 @@ class NFLWinPredictor:
         k = math.log(2) / half_life_weeks
         return 0.5 + (current_prob - 0.5) * math.exp(-k * weeks_from_now)
 
+    def get_game_scores(self):
+        """
+        Pre-logistic adjusted scores for every game from the current prediction
+        week on, used to perturb team strength before converting to probabilities.
+        """
+        schedule = self.schedule.loc[self.schedule["week"] >= self.current_prediction_week]
+
+        rows = []
+        for _, row in schedule.iterrows():
+            week, home, away = row["week"], row["home_team"], row["away_team"]
+            home_score, away_score = self.calculate_game_scores(home, away, week)
+            rows.append(
+                {
+                    "week": week,
+                    "home_team": home,
+                    "away_team": away,
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "avoided": self.is_avoided_game(home, away, week),
+                }
+            )
+        return pd.DataFrame(rows)
+
+    def batch_win_probabilities(self, scenario_overrides):
+        """
+        Score every game from the current prediction week on under several
+        adjustment scenarios in one vectorized pass.
+
+        scenario_overrides: list of override dicts for compile_adjustments
+        (use {} for the adjustments as currently written in the helper file)
+        Returns one probability DataFrame per scenario, in the same format as
+        add_win_probabilities_to_csv.
+        """
+        schedule, teams, home, away, weeks = self.game_arrays()
+        compiled = [
+            compile_adjustments(teams, max(weeks.max(), 18), overrides)
+            for overrides in scenario_overrides
+        ]
+        home_probs, away_probs = self.batch_probability_arrays(compiled, home, away, weeks)
+
+        return [
+            pd.DataFrame(
+                {
+                    "week": weeks,
+                    "home_team": schedule["home_team"].to_numpy(),
+                    "away_team": schedule["away_team"].to_numpy(),
+                    "home_win_prob": home_probs[i],
+                    "away_win_prob": away_probs[i],
+                }
+            )
+            for i in range(len(compiled))
+        ]
+
+    def game_arrays(self):
+        """
+        The schedule from the current prediction week on, as (schedule DataFrame,
+        sorted team list, home team indices, away team indices, weeks).
+        """
+        schedule = self.schedule.loc[self.schedule["week"] >= self.current_prediction_week]
+        teams = sorted(self.team_wins)
+        team_idx = {team: i for i, team in enumerate(teams)}
+        home = schedule["home_team"].map(team_idx)
+        away = schedule["away_team"].map(team_idx)
+        if home.isna().any() or away.isna().any():
+            raise ValueError("Both teams must exist in the dataset")
+        return (
+            schedule,
+            teams,
+            home.to_numpy(dtype=int),
+            away.to_numpy(dtype=int),
+            schedule["week"].to_numpy(),
+        )
+
+    def batch_probability_arrays(self, compiled, home, away, weeks):
+        """
+        compiled: compile_adjustments results, one per scenario
+        home, away, weeks: team indices and week of each game to score, which can
+        be any subset of the games from game_arrays
+        Returns (home_probs, away_probs), each (n_scenarios, n_games), rounded
+        like the probability CSV.
+        """
+        teams = sorted(self.team_wins)
+
+        def stack(name):
+            return np.stack([c[name] for c in compiled])
+
+        # Arrays are (n_scenarios, n_games)
+        strength = np.array([self.team_wins[team] for team in teams])
+        bye_weeks = np.array([self.team_bye_week[team] for team in teams])
+        home_scores = strength[home] + (
+            self.home_field_advantage + stack("home_team")[:, home]
+        )
+        away_scores = np.broadcast_to(strength[away], home_scores.shape).copy()
+
+        injuries = stack("injuries")
+        home_scores += injuries[:, home, weeks]
+        away_scores += injuries[:, away, weeks]
+
+        home_scores += np.where(bye_weeks[home] == weeks - 1, BYE_WEEK_ADJUSTMENT, 0)
+        away_scores += np.where(bye_weeks[away] == weeks - 1, BYE_WEEK_ADJUSTMENT, 0)
+
+        upset_riskiness = stack("upset_riskiness")
+        home_underdog = home_scores <= away_scores
+        home_scores += np.where(home_underdog, upset_riskiness[:, home], 0)
+        away_scores += np.where(home_underdog, 0, upset_riskiness[:, away])
+
+        momentum = stack("momentum")
+        home_scores += momentum[:, home]
+        away_scores += momentum[:, away]
+
+        division_ids = compiled[0]["division_ids"]
+        divisional = (division_ids[home] == division_ids[away]) & (division_ids[home] >= 0)
+        home_bump = divisional & (home_scores < away_scores)
+        away_bump = divisional & (away_scores < home_scores)
+        home_scores += np.where(home_bump, DIVISIONAL_UNDERDOG_MATCHUP_ADJUSTMENT, 0)
+        away_scores += np.where(away_bump, DIVISIONAL_UNDERDOG_MATCHUP_ADJUSTMENT, 0)
+
+        home_probs = 1 / (1 + np.exp(-(home_scores - away_scores) / self.scale))
+        away_probs = 1 - home_probs
+
+        avoid = stack("avoid_in_week_18")
+        avoided = (weeks == 18) & (avoid[:, home] | avoid[:, away])
+        home_probs[avoided] = 0
+        away_probs[avoided] = 0
+
+        # Vectorized time_dilate_probability
+        weeks_from_now = self.current_prediction_week - weeks
+        k = math.log(2) / self.prediction_decay_halflife
+        decay = np.exp(-k * np.maximum(weeks_from_now, 0))
+        for probs in (home_probs, away_probs):
+            dilate = (weeks_from_now > 0) & (probs != 0)
+            probs[:] = np.where(dilate, 0.5 + (probs - 0.5) * decay, probs)
+
+        return home_probs.round(4), away_probs.round(4)
+
     def add_win_probabilities_to_csv(self):
         rows = []
         calc_rows = []
 
-        schedule = pd.read_csv(SCHEDULE_CSV_PATH)
-        schedule = schedule.loc[schedule["week"] >= self.current_prediction_week]
+        schedule = self.schedule.loc[self.schedule["week"] >= self.current_prediction_week]
 
         for _, row in schedule.iterrows():
             week = row["week"]
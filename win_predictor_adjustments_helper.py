@@ -1,3 +1,5 @@
+import numpy as np
+
 # WEEKLY - NEED TO UPDATE
 ALREADY_CHOSEN_TEAMS = {
     6: ["GB", 1.0, "CIN"],
@@ -10,6 +12,12 @@ ALREADY_CHOSEN_TEAMS = {
     13: ["LAC", 1.0, "LV"],
 }
 
+# Every entry we run in the pool, each with its own picks so far (same format
+# as ALREADY_CHOSEN_TEAMS). Used by portfolio_optimizer.py
+PORTFOLIO_ENTRIES = {
+    "main": ALREADY_CHOSEN_TEAMS,
+}
+
 INJURY_ADJUSTMENTS = {
     # Season-long injuries
 
@@ -137,3 +145,69 @@ def apply_divisional_underdog_adjustment(home_team, away_team, home_score, away_
 
             return home_score, away_score
     return home_score, away_score
+
+
+ADJUSTMENT_TABLES = [
+    "INJURY_ADJUSTMENTS",
+    "MOMENTUM_ADJUSTMENTS",
+    "UPSET_RISKINESS_ADJUSTMENTS",
+    "HOME_TEAM_ADJUSTMENTS",
+    "TEAMS_TO_AVOID_IN_WEEK_18",
+]
+
+
+def compile_adjustments(teams, max_week=18, overrides=None):
+    """
+    Compile the adjustment tables above into arrays indexed by position in `teams`
+    (and by week for injuries), so many games and scenarios can be scored at once.
+
+    overrides: optional dict keyed by a name in ADJUSTMENT_TABLES. Dict tables are
+    updated per team (e.g. {"INJURY_ADJUSTMENTS": {"PIT": [[11, 13, -2.0]]}}),
+    TEAMS_TO_AVOID_IN_WEEK_18 is replaced as a whole.
+    """
+    overrides = overrides or {}
+    unknown = set(overrides) - set(ADJUSTMENT_TABLES)
+    if unknown:
+        raise ValueError(f"Unknown adjustment tables: {sorted(unknown)}")
+
+    def merged(name, table):
+        return {**table, **overrides.get(name, {})}
+
+    team_idx = {team: i for i, team in enumerate(teams)}
+    n_teams = len(teams)
+
+    injuries = np.zeros((n_teams, max_week + 1))
+    for team, injury_list in merged("INJURY_ADJUSTMENTS", INJURY_ADJUSTMENTS).items():
+        if team not in team_idx:
+            continue
+        for start_week, end_week, adjustment in injury_list:
+            injuries[team_idx[team], max(start_week, 0) : min(end_week, max_week) + 1] += adjustment
+
+    def team_vector(table):
+        vector = np.zeros(n_teams)
+        for team, value in table.items():
+            if team in team_idx:
+                vector[team_idx[team]] = value
+        return vector
+
+    avoid = np.zeros(n_teams, dtype=bool)
+    for team in overrides.get("TEAMS_TO_AVOID_IN_WEEK_18", TEAMS_TO_AVOID_IN_WEEK_18):
+        if team in team_idx:
+            avoid[team_idx[team]] = True
+
+    division_ids = np.full(n_teams, -1)
+    for i, division_teams in enumerate(divisions.values()):
+        for team in division_teams:
+            if team in team_idx:
+                division_ids[team_idx[team]] = i
+
+    return {
+        "injuries": injuries,
+        "momentum": team_vector(merged("MOMENTUM_ADJUSTMENTS", MOMENTUM_ADJUSTMENTS)),
+        "upset_riskiness": team_vector(
+            merged("UPSET_RISKINESS_ADJUSTMENTS", UPSET_RISKINESS_ADJUSTMENTS)
+        ),
+        "home_team": team_vector(merged("HOME_TEAM_ADJUSTMENTS", HOME_TEAM_ADJUSTMENTS)),
+        "avoid_in_week_18": avoid,
+        "division_ids": division_ids,
+    }
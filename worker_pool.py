@@ -0,0 +1,24 @@
+"""
+Worker processes that receive large read-only inputs (probability tables,
+candidates) once through the pool initializer, instead of with every task.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+# Filled once per worker process by the pool initializer
+worker_inputs = {}
+
+
+def _init_worker(inputs):
+    worker_inputs.update(inputs)
+
+
+def map_on_workers(func, items, inputs, max_workers=None):
+    """
+    pool.map(func, items) on worker processes where worker_inputs holds
+    `inputs`. func must be a module-level function. Returns the results as a
+    list, in the order of items.
+    """
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(inputs,)
+    ) as pool:
+        return list(pool.map(func, items))